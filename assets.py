@@ -0,0 +1,190 @@
+import pygame
+import struct
+import weakref
+from collections import OrderedDict
+
+# Default memory budget for cached surfaces (in bytes).
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+
+
+class AssetManager:
+    """
+    Keeps decoded, converted and scaled surfaces in memory so that entity
+    constructors only pay for a dictionary lookup.
+
+    Surfaces are keyed by (path, size, flip, tint). The least recently used
+    entries are dropped once the total size goes over the byte budget.
+    Entities keep their own references, so an evicted surface stays valid
+    for anyone still holding it.
+
+    With textures disabled (headless simulation) no image is decoded: every
+    request returns a blank surface of the right size, read from the PNG
+    header, so entity rects come out exactly as with real textures.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.textures_enabled = True
+        self._cache = OrderedDict()
+        # Tinted and tiled variants of arbitrary surfaces, dropped together with their base surface.
+        self._tints = weakref.WeakKeyDictionary()
+        self._tiles = weakref.WeakKeyDictionary()
+
+    def image(self, path, size=None, flip=False, tint=None):
+        """
+        Return the image at `path`, optionally scaled to `size`,
+        flipped horizontally and/or multiplied by an RGBA `tint`.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        if tint is not None:
+            tint = tuple(tint)
+        key = (path, size, flip, tint)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            return surface
+
+        if not self.textures_enabled:
+            surface = self._placeholder(path, size)
+        elif tint is not None:
+            surface = make_tinted(self.image(path, size, flip), tint)
+        elif flip:
+            surface = pygame.transform.flip(self.image(path, size), True, False)
+        elif size is not None:
+            surface = pygame.transform.smoothscale(self.image(path), size)
+        else:
+            surface = pygame.image.load(path)
+            # Converting needs a display; without one the decoded image is used as is.
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+        self._store(key, surface)
+        return surface
+
+    def _placeholder(self, path, size):
+        """Return a blank stand-in for the image at `path` (textures disabled)."""
+        if size is None:
+            size = read_png_size(path)
+        key = (None, size, False, None)
+        surface = self._cache.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            self._store(key, surface)
+        return surface
+
+    def set_textures_enabled(self, enabled):
+        """Enable or disable texture loading; disabling is meant for headless simulation."""
+        if enabled != self.textures_enabled:
+            self.textures_enabled = enabled
+            self.clear()
+
+    def tinted(self, surface, tint):
+        """
+        Return a copy of `surface` multiplied by the RGBA `tint`.
+
+        The variant is made once per (surface, tint) and kept only as long as
+        the base surface is alive. Callers must not draw onto the result.
+        """
+        if not self.textures_enabled:
+            return surface
+        variants = self._tints.get(surface)
+        if variants is None:
+            variants = {}
+            self._tints[surface] = variants
+        tint = tuple(tint)
+        tinted = variants.get(tint)
+        if tinted is None:
+            tinted = make_tinted(surface, tint)
+            variants[tint] = tinted
+        return tinted
+
+    def tiled(self, texture, width, height, tile_vertical=False):
+        """
+        Return `texture` tiled over width x height (see make_tiled).
+
+        Items of the same size and texture share one tiled surface, kept as
+        long as the texture is alive. Callers must not draw onto the result.
+        """
+        variants = self._tiles.get(texture)
+        if variants is None:
+            variants = {}
+            self._tiles[texture] = variants
+        key = (width, height, tile_vertical)
+        tiled = variants.get(key)
+        if tiled is None:
+            tiled = make_tiled(texture, width, height, tile_vertical)
+            variants[key] = tiled
+        return tiled
+
+    def image_size(self, path):
+        """Return the (width, height) of the unscaled image at `path`."""
+        if not self.textures_enabled:
+            return read_png_size(path)
+        return self.image(path).get_size()
+
+    def scaled_size(self, path, scale):
+        """Return the size of the image at `path` scaled by `scale`."""
+        width, height = self.image_size(path)
+        return (int(width * scale), int(height * scale))
+
+    def size_for_height(self, path, height):
+        """Return the size of the image at `path` scaled to `height`, keeping its aspect ratio."""
+        width, original_height = self.image_size(path)
+        return (int(width * (height / original_height)), height)
+
+    def clear(self):
+        self._cache.clear()
+        self._tints.clear()
+        self._tiles.clear()
+        self.used_bytes = 0
+
+    def _store(self, key, surface):
+        self._cache[key] = surface
+        self.used_bytes += self._surface_bytes(surface)
+        # Evict the least recently used entries, but never the one just added.
+        while self.used_bytes > self.budget_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self.used_bytes -= self._surface_bytes(evicted)
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def read_png_size(path):
+    """Read the (width, height) of a PNG file from its header without decoding it."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+def make_tinted(surface, tint):
+    """Return a new copy of `surface` multiplied by the RGBA `tint`."""
+    tinted = surface.copy()
+    overlay = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
+    overlay.fill(tint)
+    tinted.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return tinted
+
+
+def make_tiled(texture, width, height, tile_vertical=False):
+    """
+    Tile `texture` into a single surface covering width x height.
+
+    Like the old per-frame tile loop, the last tile in each direction is
+    drawn in full, so the result may stick out past the given size.
+    """
+    texture_w = texture.get_width()
+    texture_h = texture.get_height()
+    columns = max(1, -(-width // texture_w))
+    rows = max(1, -(-height // texture_h)) if tile_vertical else 1
+    tiled = pygame.Surface((columns * texture_w, rows * texture_h), pygame.SRCALPHA)
+    for col in range(columns):
+        for row in range(rows):
+            tiled.blit(texture, (col * texture_w, row * texture_h))
+    return tiled
+
+
+# Shared instance used by all entities.
+assets = AssetManager()
@@ -0,0 +1,223 @@
+"""
+Benchmark runner for the update and draw paths.
+
+Builds standard scenes with N platforms, slides, enemies, elevators, bullets
+or confetti explosions, runs them under the SDL dummy video driver with the
+frame limiter off, and times Level.update, Player.update, Level.draw and
+InventoryPanel.draw separately (plus the update and draw totals). Results
+are written as JSON with percentiles in milliseconds.
+
+Usage:
+    python benchmark.py --sizes 10,100,500 --frames 300 --output bench.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout clean for the JSON report
+
+import pygame
+
+DEFAULT_RESOLUTION = (1920, 1080)
+DEFAULT_SIZES = [10, 100, 500]
+DEFAULT_FRAMES = 300
+DEFAULT_WARMUP = 30
+PERCENTILES = [50, 90, 95, 99]
+PARTICLES_PER_EXPLOSION = 100
+# Timed stages; "update" and "draw" are the totals of the stages before them.
+STAGES = ["level_update", "player_update", "level_draw", "inventory_draw", "update", "draw"]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples_ns):
+    """Return mean/min/max and percentiles (in milliseconds) of the samples."""
+    values = sorted(ns / 1e6 for ns in samples_ns)
+    summary = {
+        "mean": sum(values) / len(values),
+        "min": values[0],
+        "max": values[-1],
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(values, pct)
+    return summary
+
+
+class Scene:
+    """A level and player populated with N items of one kind (or a mix of all kinds)."""
+
+    def __init__(self, kind, n, world_size, rng, batch_enemies=False):
+        from level import Level
+        from player import Player
+        from inventory import InventoryPanel
+        from bullet import BulletPool
+
+        self.kind = kind
+        self.n = n
+        self.rng = rng
+        self.world_size = world_size
+        self.level = Level(world_size=world_size, batch_enemies=batch_enemies)
+        self.player = Player(x=100, y=300, width=40, height=40, world_size=world_size)
+        self.inventory = InventoryPanel(*world_size)
+        # Show the inventory panel fully open (without the debug print in toggle()).
+        self.inventory.open = True
+        self.inventory.x = self.inventory.goal_x = world_size[0] - self.inventory.width
+
+        self.bullet_target = 0
+        self.particle_target = 0
+        per_kind = n if kind != "mixed" else max(1, n // 6)
+        kinds = ["platforms", "slides", "enemies", "elevators", "bullets", "confetti"] if kind == "mixed" else [kind]
+        for k in kinds:
+            self._populate(k, per_kind)
+        self.level.bullet_pool = BulletPool(capacity=max(self.bullet_target, 1))
+
+    def _random_pos(self, top=100):
+        width, height = self.world_size
+        return self.rng.randint(0, width - 200), self.rng.randint(top, height - 100)
+
+    def _populate(self, kind, count):
+        level = self.level
+        if kind == "platforms":
+            for _ in range(count):
+                level.add_platform(*self._random_pos(top=200))
+        elif kind == "slides":
+            for _ in range(count):
+                level.add_slide(*self._random_pos(top=200))
+        elif kind == "enemies":
+            for i in range(count):
+                x, _ = self._random_pos()
+                level.add_enemy(x, self.rng.randint(0, 300), self.rng.choice([1, 2, "spaghetti_monster"]))
+        elif kind == "elevators":
+            for _ in range(count):
+                level.add_elevator(*self._random_pos(top=300))
+        elif kind == "bullets":
+            self.bullet_target = count
+        elif kind == "confetti":
+            self.particle_target = count * PARTICLES_PER_EXPLOSION
+        else:
+            raise ValueError(f"unknown scene kind: {kind}")
+
+    def top_up(self):
+        """Keep the number of bullets and confetti particles steady (not timed)."""
+        level = self.level
+        width, height = self.world_size
+        while len(level.bullets) < self.bullet_target:
+            direction = self.rng.choice(["left", "right"])
+            x = 0 if direction == "right" else width
+            if not level.fire_bullet(x, self.rng.randint(20, height - 20), direction):
+                break
+        missing = self.particle_target - len(level.confetti)
+        while missing > 0:
+            level.confetti.emit(self._random_pos(), min(PARTICLES_PER_EXPLOSION, missing))
+            missing -= PARTICLES_PER_EXPLOSION
+
+
+def run_scene(kind, n, frames, warmup, world_size, seed, screen, batch_enemies=False):
+    from simulation import NoKeys
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    scene = Scene(kind, n, world_size, rng, batch_enemies)
+    level, player, inventory = scene.level, scene.player, scene.inventory
+    keys = NoKeys()
+    stages = {name: [] for name in STAGES}
+    clock = time.perf_counter_ns
+    for frame in range(warmup + frames):
+        scene.top_up()
+
+        # Update path (same order as simulation.step, with each stage timed).
+        t0 = clock()
+        player.handle_input(keys)
+        movements = level.update(player)
+        level.collect_trash(player)
+        t1 = clock()
+        player.update(level.slides, level.trampolines, level, movements, keys)
+        t2 = clock()
+
+        # Draw path (same order as the main loop).
+        level.draw_static(screen)
+        player.draw(screen)
+        player.draw_hearts(screen)
+        level.draw(screen)
+        t3 = clock()
+        inventory.draw(screen)
+        t4 = clock()
+
+        if frame >= warmup:
+            for name, ns in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t2 - t0, t4 - t2)):
+                stages[name].append(ns)
+    return {
+        "scene": kind,
+        "n": n,
+        "frames": frames,
+        "stages_ms": {name: summarize(samples) for name, samples in stages.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", default="platforms,slides,enemies,elevators,bullets,confetti,mixed",
+                        help="comma-separated scene kinds to run")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated item counts per scene")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="timed frames per run")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="untimed frames before timing")
+    parser.add_argument("--resolution", default="%dx%d" % DEFAULT_RESOLUTION, help="world/screen size, e.g. 1920x1080")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="-", help="JSON output file ('-' for stdout)")
+    parser.add_argument("--batch-enemies", action="store_true", help="step autonomous enemies with the NumPy batch")
+    args = parser.parse_args(argv)
+
+    world_size = tuple(int(v) for v in args.resolution.lower().split("x"))
+    scenes = [s.strip() for s in args.scenes.split(",") if s.strip()]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    pygame.init()
+    screen = pygame.display.set_mode(world_size)
+
+    results = []
+    for kind in scenes:
+        for n in sizes:
+            result = run_scene(kind, n, args.frames, args.warmup, world_size, args.seed, screen,
+                               args.batch_enemies)
+            results.append(result)
+            print(f"{kind:>10} n={n:<6} update p95={result['stages_ms']['update']['p95']:.3f}ms "
+                  f"draw p95={result['stages_ms']['draw']['p95']:.3f}ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": pygame.display.get_driver(),
+            "resolution": list(world_size),
+            "batch_enemies": args.batch_enemies,
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,70 @@
-import pygame
+from assets import assets
+from timestep import sim_clock
+
+BULLET_IMAGE_PATH = "images/bullet.png"
+BULLET_SPEED = 15  # Adjust bullet speed as desired
+DEFAULT_POOL_CAPACITY = 32
+
+
+def bullet_sprite():
+    """Return the shared, scaled bullet sprite."""
+    bullet_scale = 0.20  # Scale down to 20% of original size
+    return assets.image(BULLET_IMAGE_PATH, assets.scaled_size(BULLET_IMAGE_PATH, bullet_scale))
+
 
 class Bullet:
-    def __init__(self, x, y, direction):
-        self.image = pygame.image.load("images/bullet.png").convert_alpha()
-        bullet_scale = 0.20  # Scale down to 20% of original size
-        bullet_new_size = (int(self.image.get_width() * bullet_scale),
-                           int(self.image.get_height() * bullet_scale))
-        self.image = pygame.transform.smoothscale(self.image, bullet_new_size)
-        self.rect = self.image.get_rect(center=(x, y))
-        bullet_speed = 15  # Adjust bullet speed as desired
+    __slots__ = ("image", "rect", "velocity")
+
+    def __init__(self, x, y, direction, image=None):
+        self.image = image if image is not None else bullet_sprite()
+        self.rect = self.image.get_rect()
+        self.reset(x, y, direction)
+
+    def reset(self, x, y, direction):
+        """Place the bullet at (x, y) flying in `direction` ("right" or "left")."""
+        self.rect.center = (x, y)
         if direction == "right":
-            self.velocity = (bullet_speed, 0)
+            self.velocity = (BULLET_SPEED, 0)
         else:
-            self.velocity = (-bullet_speed, 0)
-    
+            self.velocity = (-BULLET_SPEED, 0)
+
     def update(self):
-        self.rect.x += self.velocity[0]
-        self.rect.y += self.velocity[1]
-    
+        self.rect.x += self.velocity[0] * sim_clock.tick_scale
+        self.rect.y += self.velocity[1] * sim_clock.tick_scale
+
     def draw(self, surface):
         surface.blit(self.image, self.rect)
-    
+
     def is_off_screen(self, screen_width, screen_height):
-        return (self.rect.right < 0 or self.rect.left > screen_width or 
-                self.rect.bottom < 0 or self.rect.top > screen_height) 
\ No newline at end of file
+        return (self.rect.right < 0 or self.rect.left > screen_width or
+                self.rect.bottom < 0 or self.rect.top > screen_height)
+
+
+class BulletPool:
+    """
+    Fixed-capacity pool of reusable bullets sharing one sprite.
+
+    All bullets are created up front; firing takes one from the free list
+    and despawning puts it back, so sustained fire allocates nothing.
+    When every bullet is in flight, spawn() returns None.
+    """
+
+    def __init__(self, capacity=DEFAULT_POOL_CAPACITY):
+        self.capacity = capacity
+        image = bullet_sprite()
+        self._free = [Bullet(0, 0, "right", image) for _ in range(capacity)]
+
+    def spawn(self, x, y, direction):
+        """Return a bullet placed at (x, y), or None if the pool is exhausted."""
+        if not self._free:
+            return None
+        bullet = self._free.pop()
+        bullet.reset(x, y, direction)
+        return bullet
+
+    def release(self, bullet):
+        """Return a bullet to the pool once it has despawned."""
+        self._free.append(bullet)
+
+    def free_count(self):
+        return len(self._free)
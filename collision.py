@@ -0,0 +1,168 @@
+import math
+import numpy as np
+from spatial import SpatialHash, DEFAULT_CELL_SIZE
+
+
+def sweep_rect(rect, dx, dy, target):
+    """
+    Return the fraction (0..1) of the move (dx, dy) at which `rect` starts
+    to overlap `target`, or None if it does not overlap it during the move.
+
+    An overlap that already exists at the start returns 0. Just touching an
+    edge does not count as overlapping (the same rule as Rect.colliderect).
+    """
+    if rect.colliderect(target):
+        return 0.0
+
+    if dx > 0:
+        x_entry = (target.left - rect.right) / dx
+        x_exit = (target.right - rect.left) / dx
+    elif dx < 0:
+        x_entry = (target.right - rect.left) / dx
+        x_exit = (target.left - rect.right) / dx
+    elif rect.right <= target.left or rect.left >= target.right:
+        return None
+    else:
+        x_entry, x_exit = -math.inf, math.inf
+
+    if dy > 0:
+        y_entry = (target.top - rect.bottom) / dy
+        y_exit = (target.bottom - rect.top) / dy
+    elif dy < 0:
+        y_entry = (target.bottom - rect.top) / dy
+        y_exit = (target.top - rect.bottom) / dy
+    elif rect.bottom <= target.top or rect.top >= target.bottom:
+        return None
+    else:
+        y_entry, y_exit = -math.inf, math.inf
+
+    entry = max(x_entry, y_entry)
+    exit_ = min(x_exit, y_exit)
+    if entry >= exit_ or entry < 0 or entry >= 1:
+        return None
+    return entry
+
+
+def limit_axis_move(rect, dx, dy, targets):
+    """
+    Shorten a move along one axis (dx or dy is 0) so `rect` cannot pass
+    completely through any of `targets` in a single step.
+
+    Moves that end overlapping a target are left alone; the usual overlap
+    resolution then puts the rect flush against it. Only when the first
+    target in the way would be skipped entirely is the move cut short, to
+    end 1 px inside that target, which gives the same resolution as a
+    smaller step would have. Returns the (possibly shortened) (dx, dy).
+    """
+    end = rect.copy()
+    end.x += dx
+    end.y += dy
+    # Passing through a target takes a shift of more than the rect's own size.
+    if abs(end.x - rect.x) <= rect.width and abs(end.y - rect.y) <= rect.height:
+        return dx, dy
+    first_overlap = None
+    first_tunnel = None
+    for target in targets:
+        t = sweep_rect(rect, dx, dy, target)
+        if t is None or t == 0.0:
+            continue
+        if end.colliderect(target):
+            if first_overlap is None or t < first_overlap:
+                first_overlap = t
+        elif first_tunnel is None or t < first_tunnel[0]:
+            # Only count it if the end position is past the target, not just short of it.
+            if ((dy > 0 and end.top >= target.bottom) or (dy < 0 and end.bottom <= target.top) or
+                    (dx > 0 and end.left >= target.right) or (dx < 0 and end.right <= target.left)):
+                first_tunnel = (t, target)
+    if first_tunnel is None or (first_overlap is not None and first_overlap <= first_tunnel[0]):
+        return dx, dy
+    target = first_tunnel[1]
+    if dy > 0:
+        return dx, target.top + 1 - rect.bottom
+    if dy < 0:
+        return dx, target.bottom - 1 - rect.top
+    if dx > 0:
+        return target.left + 1 - rect.right, dy
+    return target.right - 1 - rect.left, dy
+
+
+class CollisionWorld:
+    """
+    Everything solid in a level, kept up to date as the level changes.
+
+    Static colliders (platforms) and kinematic ones (elevator platforms)
+    live in their own spatial grids. The level tells the world when one is
+    added, removed, dragged or moved, so physics code only ever queries it
+    and never builds collider lists of its own. Queries return static
+    colliders before kinematic ones, each in the order they were added.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.static = SpatialHash(cell_size)
+        self.kinematic = SpatialHash(cell_size)
+        self._static_bounds = None
+
+    def add_static(self, item):
+        self.static.insert(item, item.rect)
+        self._static_bounds = None
+
+    def add_static_many(self, items):
+        self.static.insert_many((item, item.rect) for item in items)
+        self._static_bounds = None
+
+    def remove_static(self, item):
+        self.static.remove(item)
+        self._static_bounds = None
+
+    def move_static(self, item):
+        """Re-index a static collider after its rect changed (e.g. while dragged)."""
+        if item in self.static:
+            self.static.update(item, item.rect)
+            self._static_bounds = None
+
+    def add_kinematic(self, elevator):
+        self.kinematic.insert(elevator, elevator.platform_rect)
+
+    def add_kinematic_many(self, elevators):
+        self.kinematic.insert_many((elevator, elevator.platform_rect) for elevator in elevators)
+
+    def remove_kinematic(self, elevator):
+        self.kinematic.remove(elevator)
+
+    def move_kinematic(self, elevator):
+        self.kinematic.update(elevator, elevator.platform_rect)
+
+    def static_near(self, rect):
+        """Return the static colliders that may overlap `rect`."""
+        return self.static.query(rect)
+
+    def static_at(self, x, y):
+        """Return the static colliders that may contain the point (x, y)."""
+        return self.static.query_point(x, y)
+
+    def colliders_near(self, rect, exclude=None):
+        """
+        Return everything solid that may overlap `rect`: static colliders
+        first, then elevator platform rects (skipping the elevator `exclude`).
+        """
+        colliders = self.static.query(rect)
+        for elevator in self.kinematic.query(rect):
+            if elevator is not exclude:
+                colliders.append(elevator.platform_rect)
+        return colliders
+
+    def elevators_touching(self, rect):
+        """Return the elevators whose platform overlaps `rect`."""
+        return [elevator for elevator in self.kinematic.query(rect) if rect.colliderect(elevator.platform_rect)]
+
+    def static_bounds(self):
+        """
+        Return the static colliders' left, top, right and bottom edges as
+        NumPy arrays (in the order they were added), rebuilt only after a
+        static collider was added, removed or moved.
+        """
+        if self._static_bounds is None:
+            rects = np.array([tuple(item.rect) for item in self.static.items()], dtype=np.int64).reshape(-1, 4)
+            left, top = rects[:, 0], rects[:, 1]
+            self._static_bounds = (left, top, left + rects[:, 2], top + rects[:, 3])
+        return self._static_bounds
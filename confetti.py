@@ -1,46 +1,118 @@
 import pygame
 import math
 import random
+import numpy as np
+from timestep import sim_clock
 
-class ConfettiParticle:
-    def __init__(self, pos):
-        self.x, self.y = pos
-        self.radius = random.randint(3, 6)
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(5, 10)
-        self.vx = speed * math.cos(angle)
-        self.vy = speed * math.sin(angle)
-        self.lifetime = random.randint(30, 60)
-        self.color = random.choice([
-            (255, 0, 0), (0, 255, 0), (0, 0, 255),
-            (255, 255, 0), (255, 0, 255), (0, 255, 255),
-            (255, 165, 0), (128, 0, 128)
-        ])
-        self.gravity = 0.5
+COLORS = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255),
+    (255, 255, 0), (255, 0, 255), (0, 255, 255),
+    (255, 165, 0), (128, 0, 128)
+]
+MIN_RADIUS = 3
+MAX_RADIUS = 6
+GRAVITY = 0.5
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.lifetime -= 1
+# Global budget: the pool never holds more live particles than this.
+MAX_PARTICLES = 5000
 
-    def draw(self, surface):
-        if self.lifetime > 0:
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.radius)
 
-class ConfettiExplosion:
-    def __init__(self, pos, num_particles=100):
-        self.particles = [ConfettiParticle(pos) for _ in range(num_particles)]
+class ConfettiPool:
+    """
+    All confetti particles of a level, stored as NumPy arrays.
+
+    Each explosion just appends particles to the arrays; updating moves all
+    of them at once and drawing is a single Surface.blits call using small
+    pre-drawn circle stamps (one per radius and color).
+    """
+
+    def __init__(self, max_particles=MAX_PARTICLES, rng=None):
+        self.max_particles = max_particles
+        # Seeded from the `random` module so that seeding it also fixes the confetti.
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(32))
+        self.pos = np.zeros((max_particles, 2))
+        self.vel = np.zeros((max_particles, 2))
+        # Remaining lifetime in reference ticks (fractional at other simulation rates).
+        self.lifetime = np.zeros(max_particles)
+        self.radius = np.zeros(max_particles, dtype=np.int32)
+        self.stamp = np.zeros(max_particles, dtype=np.int32)
+        self.count = 0
+        self._stamps = None
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, pos, num_particles=100):
+        """Spawn an explosion of particles at `pos`."""
+        num_particles = min(num_particles, self.max_particles)
+        free = self.max_particles - self.count
+        if num_particles > free:
+            self._drop_oldest(num_particles - free)
+        start, end = self.count, self.count + num_particles
+        angle = self.rng.uniform(0, 2 * math.pi, num_particles)
+        speed = self.rng.uniform(5, 10, num_particles)
+        radius_index = self.rng.integers(0, MAX_RADIUS - MIN_RADIUS + 1, num_particles)
+        color_index = self.rng.integers(0, len(COLORS), num_particles)
+        self.pos[start:end] = pos
+        self.vel[start:end, 0] = speed * np.cos(angle)
+        self.vel[start:end, 1] = speed * np.sin(angle)
+        self.lifetime[start:end] = self.rng.integers(30, 61, num_particles)
+        self.radius[start:end] = radius_index + MIN_RADIUS
+        self.stamp[start:end] = radius_index * len(COLORS) + color_index
+        self.count = end
+
+    def _drop_oldest(self, n):
+        """Make room for `n` particles by removing the ones closest to dying."""
+        keep = np.argsort(self.lifetime[:self.count], kind="stable")[n:]
+        keep.sort()
+        self._compact(keep)
+
+    def _compact(self, keep):
+        kept = len(keep)
+        for array in (self.pos, self.vel, self.lifetime, self.radius, self.stamp):
+            array[:kept] = array[keep]
+        self.count = kept
 
     def update(self):
-        for particle in self.particles:
-            particle.update()
+        if self.count == 0:
+            return
+        n = self.count
+        scale = sim_clock.tick_scale
+        self.pos[:n] += self.vel[:n] * scale
+        self.vel[:n, 1] += GRAVITY * scale
+        self.lifetime[:n] -= scale
         # Remove particles once their lifetime is over
-        self.particles = [p for p in self.particles if p.lifetime > 0]
+        alive = self.lifetime[:n] > 0
+        if not alive.all():
+            self._compact(np.flatnonzero(alive))
+
+    def _build_stamps(self):
+        stamps = []
+        for radius in range(MIN_RADIUS, MAX_RADIUS + 1):
+            for color in COLORS:
+                stamp = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+                pygame.draw.circle(stamp, color, (radius, radius), radius)
+                stamps.append(stamp)
+        self._stamps = np.empty(len(stamps), dtype=object)
+        self._stamps[:] = stamps
 
     def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
+        if self.count == 0:
+            return
+        if self._stamps is None:
+            self._build_stamps()
+        n = self.count
+        top_left = (self.pos[:n].astype(np.int32) - self.radius[:n, None]).tolist()
+        surface.blits(zip(self._stamps[self.stamp[:n]].tolist(), top_left), doreturn=False)
+
+    def get_rect(self):
+        """Return the bounding rect of all live particles (None if there are none)."""
+        if self.count == 0:
+            return None
+        n = self.count
+        left, top = (self.pos[:n] - self.radius[:n, None]).min(axis=0)
+        right, bottom = (self.pos[:n] + self.radius[:n, None]).max(axis=0)
+        return pygame.Rect(int(left) - 1, int(top) - 1, int(right - left) + 3, int(bottom - top) + 3)
 
-    def is_finished(self):
-        return len(self.particles) == 0 
\ No newline at end of file
+    def clear(self):
+        self.count = 0
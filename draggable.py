@@ -1,31 +1,38 @@
 import pygame
+from assets import assets
 
 class Draggable:
     def __init__(self):
         self.being_dragged = False
+        # The level this object belongs to; notified whenever the object is edited.
+        self.owner = None
+
+    def notify_changed(self):
+        """Tell the owning level that this object was moved or changed."""
+        if self.owner is not None:
+            self.owner.item_changed(self)
 
     def start_drag(self, mouse_x, mouse_y):
         """Record the offset between the object's position and the mouse position and mark it as being dragged."""
         self.drag_offset_x = self.rect.x - mouse_x
         self.drag_offset_y = self.rect.y - mouse_y
         self.being_dragged = True
+        self.notify_changed()
 
     def update_drag(self, mouse_x, mouse_y):
         """Update the object's position based on the mouse position and stored offset."""
         self.rect.x = mouse_x + self.drag_offset_x
         self.rect.y = mouse_y + self.drag_offset_y
+        self.notify_changed()
 
     def end_drag(self):
         """Mark the object as no longer being dragged."""
         self.being_dragged = False
+        self.notify_changed()
 
     def get_tinted_surface(self, surface, tint_color=(255, 0, 255, 128)):
-        """Return a tinted copy of the given surface."""
-        tinted = surface.copy()
-        overlay = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
-        overlay.fill(tint_color)
-        tinted.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        return tinted
+        """Return a tinted copy of the given surface (cached per surface and tint)."""
+        return assets.tinted(surface, tint_color)
 
     def handle_click(self, event):
         """
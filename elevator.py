@@ -1,6 +1,9 @@
 import pygame
 import math
 from draggable import Draggable
+from assets import assets
+from fonts import render_text
+from timestep import sim_clock
 
 class ElevatorPoint(Draggable):
     def __init__(self, x, y, is_start=True, elevator_id=1):
@@ -8,14 +11,13 @@ class ElevatorPoint(Draggable):
         self.rect = pygame.Rect(x, y, 30, 30)
         self.is_start = is_start
         self.elevator_id = elevator_id
-        self.font = pygame.font.SysFont(None, 24)
         
     def draw(self, surface):
         color = (0, 255, 0) if self.is_start else (255, 0, 0)
         if self.being_dragged:
             color = (255, 0, 255)
         pygame.draw.circle(surface, color, self.rect.center, 15)
-        text = self.font.render(str(self.elevator_id), True, (255, 255, 255))
+        text = render_text(str(self.elevator_id), 24, (255, 255, 255))
         text_rect = text.get_rect(center=self.rect.center)
         surface.blit(text, text_rect)
 
@@ -30,17 +32,22 @@ class Elevator:
         self.speed = 3
         self.direction = -1
         self.current_pos = pygame.Vector2(start_x, start_y)
-        stone_texture_orig = pygame.image.load("images/stone-platform.png").convert_alpha()
-        height_ratio = self.platform_height / stone_texture_orig.get_height()
-        scaled_w = int(stone_texture_orig.get_width() * height_ratio)
-        self.stone_texture = pygame.transform.smoothscale(stone_texture_orig, (scaled_w, self.platform_height))
+        self.stone_texture = assets.image("images/stone-platform.png",
+                                          assets.size_for_height("images/stone-platform.png", self.platform_height))
+        self._baked = None
+        self._baked_key = None
     
+    def step_length(self):
+        """Distance the platform moves in one simulation step."""
+        return self.speed * sim_clock.tick_scale
+
     def update(self, platforms):
+        speed = self.step_length()
         target = self.end_point.rect.center if self.direction == 1 else self.start_point.rect.center
         target_vec = pygame.Vector2(target)
         move_vec = target_vec - self.current_pos
-        if move_vec.length() > self.speed:
-            move_step = move_vec.normalize() * self.speed
+        if move_vec.length() > speed:
+            move_step = move_vec.normalize() * speed
         else:
             move_step = move_vec
         temp_rect = self.platform_rect.copy()
@@ -50,19 +57,30 @@ class Elevator:
             self.direction *= -1
         else:
             self.current_pos += move_step
-            if (self.current_pos - target_vec).length() <= self.speed:
+            if (self.current_pos - target_vec).length() <= speed:
                 self.current_pos = target_vec
                 self.direction *= -1
         self.platform_rect.center = (round(self.current_pos.x), round(self.current_pos.y))
     
+    def get_platform_image(self):
+        """Return the pre-tiled platform image, rebaking it only when the size or texture changed."""
+        key = (self.platform_rect.width, self.platform_rect.height, self.stone_texture)
+        if key != self._baked_key:
+            self._baked = assets.tiled(self.stone_texture, self.platform_rect.width, self.platform_rect.height)
+            self._baked_key = key
+        return self._baked
+
     def draw(self, surface):
         pygame.draw.line(surface, (100, 100, 100), self.start_point.rect.center, self.end_point.rect.center, 2)
-        texture_w = self.stone_texture.get_width()
-        for x in range(self.platform_rect.x, self.platform_rect.x + self.platform_rect.width, texture_w):
-            surface.blit(self.stone_texture, (x, self.platform_rect.y))
+        surface.blit(self.get_platform_image(), self.platform_rect.topleft)
         self.start_point.draw(surface)
         self.end_point.draw(surface)
     
+    def get_rect(self):
+        """Return the area covered by the track, both end points and the platform."""
+        platform_area = self.get_platform_image().get_rect(topleft=self.platform_rect.topleft)
+        return platform_area.unionall([self.start_point.rect, self.end_point.rect])
+
     def contains_point(self, x, y):
         if self.platform_rect.collidepoint(x, y):
             return True
@@ -1,6 +1,7 @@
 import pygame
 from physics_object import PhysicsObject
 from draggable import Draggable
+from assets import assets
 
 class Enemy(PhysicsObject, Draggable):
     def __init__(self, x, y, enemy_type):
@@ -15,13 +16,9 @@ class Enemy(PhysicsObject, Draggable):
         else:
             image_path = f"images/enemy{enemy_type}.png"
 
-        # Load and scale the image.
-        original_image = pygame.image.load(image_path).convert_alpha()
-        scaled_image = pygame.transform.smoothscale(original_image, (120, 120))
-
-        # Cache both right- and left-facing images.
-        self.image_right = scaled_image
-        self.image_left = pygame.transform.flip(scaled_image, True, False)
+        # Both right- and left-facing images come from the shared asset cache.
+        self.image_right = assets.image(image_path, (120, 120))
+        self.image_left = assets.image(image_path, (120, 120), flip=True)
 
         # Set the initial image and facing direction.
         self.image = self.image_right
@@ -37,16 +34,14 @@ class Enemy(PhysicsObject, Draggable):
         # Autonomous movement: 1 for right, -1 for left.
         self.autonomous_direction = 1
 
-    def update(self, platforms, level, elevator_movements):
+    def update(self, level, elevator_movements):
         if self.being_dragged:
             return
         # If not controlled by the player, set our horizontal speed automatically.
         if not self.controlled:
             self.x_velocity = 5 * self.autonomous_direction
-        # Combine the regular platforms with elevator platforms.
-        all_platforms = platforms.copy()
-        for elevator in level.elevators:
-            all_platforms.append(elevator.platform_rect)
+        # Platforms and elevator platforms near the area we can move through this frame.
+        all_platforms = level.collision_world.colliders_near(self.swept_rect())
         # Remember the x-position before updating physics.
         old_x = self.rect.x
         self.update_physics(all_platforms, level.trampolines, level.portals, level)
@@ -63,14 +58,14 @@ class Enemy(PhysicsObject, Draggable):
                     look_x = self.rect.left - 1
                 look_y = self.rect.bottom + 1
                 ground_ahead = False
-                for platform in platforms:
+                for platform in level.collision_world.static_at(look_x, look_y):
                     # Assume each platform has a 'rect' attribute.
                     if platform.rect.collidepoint(look_x, look_y):
                         ground_ahead = True
                         break
                 if not ground_ahead:
                     self.autonomous_direction *= -1
-        self._handle_elevators(level.elevators, elevator_movements)
+        self._handle_elevators(level.collision_world.elevators_touching(self.rect), elevator_movements)
 
         # Update facing direction based on the current horizontal velocity.
         if self.x_velocity < 0:
@@ -84,11 +79,7 @@ class Enemy(PhysicsObject, Draggable):
         else:
             self.image = self.image_right
 
-    def _handle_elevators(self, elevators, elevator_movements):
-        elevator_collisions = []
-        for elevator in elevators:
-            if self.rect.colliderect(elevator.platform_rect):
-                elevator_collisions.append(elevator)
+    def _handle_elevators(self, elevator_collisions, elevator_movements):
         for elevator in elevator_collisions:
             if self.rect.bottom == elevator.platform_rect.top:
                 movement = elevator_movements.get(elevator, (0, 0))
@@ -119,8 +110,9 @@ class Enemy(PhysicsObject, Draggable):
                 return "remove"
         return None
 
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
+    def handle_input(self, keys=None):
+        if keys is None:
+            keys = pygame.key.get_pressed()
         if keys[pygame.K_LEFT]:
             self.x_velocity = -5
         elif keys[pygame.K_RIGHT]:
@@ -0,0 +1,143 @@
+import numpy as np
+from physics_object import PhysicsObject
+from timestep import sim_clock
+
+# Horizontal speed of autonomous enemies (as set in Enemy.update).
+ENEMY_SPEED = 5
+
+
+class EnemyBatch:
+    """
+    Steps all autonomous enemies of a level at once with NumPy.
+
+    For every enemy that is neither controlled nor dragged, the positions,
+    velocities, directions and ground flags are gathered into arrays, and
+    gravity, platform collisions and the edge/wall turnaround are computed
+    for all of them together against the level's platforms, then written
+    back. The rules are the same as Enemy.update, including resolving
+    against the first overlapping platform in index order, so the results
+    match the per-enemy path exactly.
+
+    Enemies that might touch a trampoline, portal or elevator this step, or
+    that move far enough to need a swept collision test, go through
+    Enemy.update instead, as do controlled and dragged enemies.
+    """
+
+    def __init__(self, level):
+        self.level = level
+        # Trampoline and entrance portal rects, and the pick index version they were taken at.
+        self._fixed_rects = None
+        self._fixed_version = None
+
+    def _special_rects(self):
+        """Rects of everything the batch does not handle (trampolines, entrance portals, elevators)."""
+        level = self.level
+        # Trampolines and portals only move when they are edited, which changes the pick index.
+        if self._fixed_rects is None or self._fixed_version != level.pick_index.version:
+            rects = [tramp.rect for tramp in level.trampolines]
+            rects.extend(portal.rect for portal in level.portals if getattr(portal, "is_entrance", False))
+            self._fixed_rects = np.array([tuple(r) for r in rects], dtype=np.int64).reshape(-1, 4)
+            self._fixed_version = level.pick_index.version
+        if not level.elevators:
+            return self._fixed_rects
+        # Elevator platforms move every step.
+        moving = np.array([tuple(e.platform_rect) for e in level.elevators], dtype=np.int64).reshape(-1, 4)
+        return np.concatenate((self._fixed_rects, moving))
+
+    def update(self, elevator_movements):
+        level = self.level
+        batch = []
+        for enemy in level.enemies:
+            if enemy.controlled or enemy.being_dragged:
+                enemy.update(level, elevator_movements)
+            else:
+                batch.append(enemy)
+        if not batch:
+            return
+
+        scale = sim_clock.tick_scale
+        gravity = PhysicsObject.GRAVITY * scale
+        n = len(batch)
+        state = np.array([(e.rect.x, e.rect.y, e.rect.width, e.rect.height, e.autonomous_direction)
+                          for e in batch], dtype=np.int64).reshape(n, 5)
+        x, y, w, h, direction = state.T
+        vy = np.array([e.y_velocity for e in batch], dtype=np.float64)
+        vx = ENEMY_SPEED * direction
+
+        # Enemies whose reachable area (the same area PhysicsObject.swept_rect
+        # covers, plus a pixel of slack) meets a special rect take the slow path.
+        vy = vy + gravity
+        dy = vy * scale
+        dx = vx * scale
+        reach_left = np.minimum(x, x + dx) - w - 1
+        reach_right = np.maximum(x, x + dx) + 2 * w + 1
+        reach_top = np.minimum(y, y + dy) - h - 1
+        reach_bottom = np.maximum(y, y + dy) + 2 * h + 1
+        special = self._special_rects()
+        slow = np.zeros(n, dtype=bool)
+        if len(special):
+            s_left, s_top = special[:, 0], special[:, 1]
+            s_right, s_bottom = s_left + special[:, 2], s_top + special[:, 3]
+            slow |= ((reach_left[:, None] < s_right) & (reach_right[:, None] > s_left) &
+                     (reach_top[:, None] < s_bottom) & (reach_bottom[:, None] > s_top)).any(axis=1)
+
+        # Vertical move (Rect attributes truncate toward zero).
+        y1 = np.trunc(y + dy).astype(np.int64)
+        # Moves longer than the enemy itself are swept by the slow path.
+        slow |= np.abs(y1 - y) > h
+
+        p_left, p_top, p_right, p_bottom = level.collision_world.static_bounds()
+        on_ground = np.zeros(n, dtype=bool)
+        if len(p_left):
+            hit = ((x[:, None] < p_right) & (x[:, None] + w[:, None] > p_left) &
+                   (y1[:, None] < p_bottom) & (y1[:, None] + h[:, None] > p_top))
+            has_hit = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            falling = has_hit & (vy > 0)
+            rising = has_hit & (vy < 0)
+            y1 = np.where(falling, p_top[first] - h, np.where(rising, p_bottom[first], y1))
+            vy = np.where(falling | rising, 0.0, vy)
+            on_ground = falling
+
+        # Horizontal move.
+        x1 = np.trunc(x + dx).astype(np.int64)
+        slow |= np.abs(x1 - x) > w
+        if len(p_left):
+            hit = ((x1[:, None] < p_right) & (x1[:, None] + w[:, None] > p_left) &
+                   (y1[:, None] < p_bottom) & (y1[:, None] + h[:, None] > p_top))
+            has_hit = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            x1 = np.where(has_hit & (vx > 0), p_left[first] - w, np.where(has_hit & (vx < 0), p_right[first], x1))
+            vx = np.where(has_hit, 0, vx)
+
+        # Turn around when blocked, or when there is no ground just ahead.
+        blocked = x1 == x
+        look_x = np.where(direction > 0, x1 + w + 1, x1 - 1)
+        look_y = y1 + h + 1
+        ground_ahead = np.zeros(n, dtype=bool)
+        if len(p_left):
+            ground_ahead = ((p_left <= look_x[:, None]) & (look_x[:, None] < p_right) &
+                            (p_top <= look_y[:, None]) & (look_y[:, None] < p_bottom)).any(axis=1)
+        turn = blocked | (on_ground & ~ground_ahead)
+        direction = np.where(turn, -direction, direction)
+
+        rows = zip(batch, slow.tolist(), x1.tolist(), y1.tolist(), vx.tolist(), vy.tolist(),
+                   on_ground.tolist(), direction.tolist())
+        for enemy, is_slow, new_x, new_y, new_vx, new_vy, grounded, new_direction in rows:
+            if is_slow:
+                enemy.update(level, elevator_movements)
+                continue
+            enemy.rect.x = new_x
+            enemy.rect.y = new_y
+            enemy.x_velocity = new_vx
+            enemy.y_velocity = new_vy
+            enemy.on_ground = grounded
+            enemy.autonomous_direction = new_direction
+            enemy.on_elevator = False
+            if hasattr(enemy, "elevator_offset"):
+                del enemy.elevator_offset
+            if new_vx < 0:
+                enemy.facing_direction = -1
+            elif new_vx > 0:
+                enemy.facing_direction = 1
+            enemy.image = enemy.image_left if enemy.facing_direction < 0 else enemy.image_right
@@ -0,0 +1,35 @@
+import pygame
+from collections import OrderedDict
+
+# Maximum number of rendered text surfaces kept around.
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+_text_cache = OrderedDict()
+
+
+def get_font(size, name=None):
+    """Return a shared SysFont for the given name and size (created once)."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, size, color, name=None):
+    """
+    Return an antialiased surface for `text`, reusing a previously rendered
+    surface when the same (font, size, text, color) was drawn before.
+    """
+    key = (name, size, text, tuple(color))
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+    surface = get_font(size, name).render(text, True, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
@@ -1,5 +1,6 @@
 import pygame
 from draggable import Draggable
+from assets import assets
 
 class Platform:
     def __init__(self, x, y, width, height, texture, tile_vertical=False):
@@ -16,36 +17,24 @@ class Platform:
         self.rect = pygame.Rect(x, y, width, height)
         self.texture = texture
         self.tile_vertical = tile_vertical
+        self._baked = None
+        self._baked_key = None
+
+    def get_image(self):
+        """Return the pre-tiled platform image, rebaking it only when the size or texture changed."""
+        key = (self.rect.width, self.rect.height, self.texture)
+        if key != self._baked_key:
+            self._baked = assets.tiled(self.texture, self.rect.width, self.rect.height, self.tile_vertical)
+            self._baked_key = key
+        return self._baked
 
     def draw(self, surface):
-        """Draw the platform by tiling its texture."""
-        if self.tile_vertical:
-            texture_w = self.texture.get_width()
-            texture_h = self.texture.get_height()
-            for x in range(self.rect.x, self.rect.x + self.rect.width, texture_w):
-                for y in range(self.rect.y, self.rect.y + self.rect.height, texture_h):
-                    surface.blit(self.texture, (x, y))
-        else:
-            texture_w = self.texture.get_width()
-            for x in range(self.rect.x, self.rect.x + self.rect.width, texture_w):
-                surface.blit(self.texture, (x, self.rect.y))
+        """Draw the platform with a single blit of its baked image."""
+        surface.blit(self.get_image(), self.rect.topleft)
 
     def draw_tinted(self, surface, tint_color):
         """Draw a tinted version of the platform."""
-        tinted_texture = self.texture.copy()
-        overlay = pygame.Surface(tinted_texture.get_size(), pygame.SRCALPHA)
-        overlay.fill(tint_color)
-        tinted_texture.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        if self.tile_vertical:
-            texture_w = tinted_texture.get_width()
-            texture_h = tinted_texture.get_height()
-            for x in range(self.rect.x, self.rect.x + self.rect.width, texture_w):
-                for y in range(self.rect.y, self.rect.y + self.rect.height, texture_h):
-                    surface.blit(tinted_texture, (x, y))
-        else:
-            texture_w = tinted_texture.get_width()
-            for x in range(self.rect.x, self.rect.x + self.rect.width, texture_w):
-                surface.blit(tinted_texture, (x, self.rect.y))
+        surface.blit(assets.tinted(self.get_image(), tint_color), self.rect.topleft)
 
     def __getattr__(self, attr):
         # Delegate attribute lookup to the underlying rect so that properties such as .top, .bottom, etc. work.
@@ -62,10 +51,8 @@ class Ground(Platform):
         """
         if height is None:
             height = Ground.DEFAULT_HEIGHT
-        original = pygame.image.load(Ground.DEFAULT_IMAGE_PATH).convert_alpha()
-        ratio = height / original.get_height()
-        new_width = int(original.get_width() * ratio)
-        texture = pygame.transform.smoothscale(original, (new_width, height))
+        texture = assets.image(Ground.DEFAULT_IMAGE_PATH,
+                               assets.size_for_height(Ground.DEFAULT_IMAGE_PATH, height))
         super().__init__(x, y, width, height, texture, tile_vertical=True)
 
 class StonePlatform(Platform, Draggable):
@@ -76,10 +63,8 @@ class StonePlatform(Platform, Draggable):
         Stone platforms tile their texture only horizontally.
         """
         Draggable.__init__(self)
-        original = pygame.image.load(StonePlatform.DEFAULT_IMAGE_PATH).convert_alpha()
-        ratio = height / original.get_height()
-        new_width = int(original.get_width() * ratio)
-        texture = pygame.transform.smoothscale(original, (new_width, height))
+        texture = assets.image(StonePlatform.DEFAULT_IMAGE_PATH,
+                               assets.size_for_height(StonePlatform.DEFAULT_IMAGE_PATH, height))
         super().__init__(x, y, width, height, texture, tile_vertical=False)
 
     def draw(self, surface):
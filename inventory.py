@@ -1,4 +1,7 @@
 import pygame
+from fonts import render_text
+from assets import assets
+from timestep import sim_clock
 
 # Mouse cursors
 DEFAULT_CURSOR = pygame.SYSTEM_CURSOR_ARROW
@@ -82,9 +85,7 @@ CHARACTERS = [
         "id": "big",
         "portrait": pygame.image.load("images/player_big_portrait.png"),
         "sprite": "images/player_big.png",
-        "ouch_sound": "sounds/big_player_ouch.wav",
-        "boing_sound": "sounds/big_player_boing.wav",
-        "portal_sound": "sounds/big_player_portal.wav",
+        "voice": "big",  # Named voice set from sound_bank.VOICE_SETS
         "rect": pygame.Rect(0, 0, PORTRAIT_SIZE, PORTRAIT_SIZE),
         "hovered": False
     },
@@ -92,9 +93,7 @@ CHARACTERS = [
         "id": "small",
         "portrait": pygame.image.load("images/player_small_portrait.png"),
         "sprite": "images/player_small.png",
-        "ouch_sound": "sounds/small_player_ouch.wav",
-        "boing_sound": "sounds/small_player_boing.wav",
-        "portal_sound": "sounds/small_player_portal.wav",
+        "voice": "small",  # Named voice set from sound_bank.VOICE_SETS
         "rect": pygame.Rect(0, 0, PORTRAIT_SIZE, PORTRAIT_SIZE),
         "hovered": False
     },
@@ -102,9 +101,7 @@ CHARACTERS = [
         "id": "boy",
         "portrait": pygame.image.load("images/player_boy_portrait.png"),
         "sprite": "images/player_boy.png",
-        "ouch_sound": "sounds/boy_player_ouch.wav",
-        "boing_sound": "sounds/boy_player_boing.wav",
-        "portal_sound": "sounds/boy_player_portal.wav",
+        "voice": "boy",  # Named voice set from sound_bank.VOICE_SETS
         "rect": pygame.Rect(0, 0, PORTRAIT_SIZE, PORTRAIT_SIZE),
         "hovered": False
     }
@@ -160,6 +157,10 @@ class InventoryPanel:
         # Track which icon is hovered
         self.hovered_icon = None
 
+        # Areas painted outside the panel during the last draw (for dirty rectangle presentation)
+        self.ghost_rect = None
+        self.tooltip_rect = None
+
         # Scale portrait images
         for char in CHARACTERS:
             char["portrait"] = pygame.transform.smoothscale(char["portrait"],
@@ -170,13 +171,9 @@ class InventoryPanel:
         for icon in ICONS:
             if "image_path" in icon:  # Only load if image_path exists
                 if icon["type"] == "platform":
-                    # Load original texture
-                    original = pygame.image.load(icon["image_path"]).convert_alpha()
                     # Scale height to match platform height (20px)
-                    height_ratio = 20 / original.get_height()
-                    block_width = int(original.get_width() * height_ratio)
-                    block_height = 20
-                    scaled_block = pygame.transform.smoothscale(original, (block_width, block_height))
+                    block_width, block_height = assets.size_for_height(icon["image_path"], 20)
+                    scaled_block = assets.image(icon["image_path"], (block_width, block_height))
                     
                     # Create surface for the full platform width
                     platform_surface = pygame.Surface((icon["rect"].width, block_height), pygame.SRCALPHA)
@@ -186,12 +183,7 @@ class InventoryPanel:
                     self.textures[icon["type"]] = platform_surface
                 else:
                     # Handle other textures normally
-                    original = pygame.image.load(icon["image_path"]).convert_alpha()
-                    scaled = pygame.transform.smoothscale(
-                        original, 
-                        (icon["rect"].width, icon["rect"].height)
-                    )
-                    self.textures[icon["type"]] = scaled
+                    self.textures[icon["type"]] = assets.image(icon["image_path"], icon["rect"].size)
 
         # Center each icon horizontally in the panel
         for icon in ICONS:
@@ -203,12 +195,7 @@ class InventoryPanel:
         for icon in ICONS:
             if "image_path" in icon:
                 if icon["type"] == "star":
-                    original = pygame.image.load(icon["image_path"]).convert_alpha()
-                    scaled = pygame.transform.smoothscale(
-                        original,
-                        (icon["rect"].width, icon["rect"].height)
-                    )
-                    self.textures[icon["type"]] = scaled
+                    self.textures[icon["type"]] = assets.image(icon["image_path"], icon["rect"].size)
 
         # Add scrolling properties
         self.scroll_offset = 0  # How much we've scrolled down
@@ -235,6 +222,17 @@ class InventoryPanel:
         self.char_scroll_offset = 0
         self.char_max_scroll = max(0, self.char_total_width - self.width)
 
+        # Pre-rendered panel appearance. The body never changes; the full panel
+        # (titles, icons, characters) is only redrawn when scroll or hover state changes.
+        self.panel_body = self._render_panel_body()
+        self.char_bg = pygame.Surface((self.width, self.char_section_height), pygame.SRCALPHA)
+        self.char_bg.fill((140, 140, 140, 200))  # Slightly darker background
+        self.panel_cache = None
+        self.panel_cache_state = None
+
+        # Current mouse cursor, so it is only changed when the state changes
+        self.cursor = None
+
     def toggle(self, screen_width):
         self.open = not self.open
         if self.open:
@@ -244,39 +242,50 @@ class InventoryPanel:
             self.goal_x = screen_width
             print(f"Closing panel: goal_x = {self.goal_x}")  # Debug print
 
+    def set_cursor(self, cursor):
+        """Change the mouse cursor, but only if it differs from the current one."""
+        if cursor != self.cursor:
+            try:
+                pygame.mouse.set_cursor(cursor)
+            except pygame.error:
+                pass  # no system cursors (e.g. SDL dummy video driver)
+            self.cursor = cursor
+
+    def character_index_at(self, pos):
+        """Return the index of the character portrait under `pos` (screen coordinates), or None."""
+        rel_x = pos[0] - (self.x + self.char_base_x + self.char_scroll_offset)
+        rel_y = pos[1] - (self.char_section_y + 20)
+        if rel_x < 0 or not 0 <= rel_y < PORTRAIT_SIZE:
+            return None
+        index, offset = divmod(rel_x, PORTRAIT_SIZE + 10)
+        if offset < PORTRAIT_SIZE and index < len(CHARACTERS):
+            return index
+        return None
+
     def update_icon_hover_states(self, mouse_pos):
         """Updated to account for scrolling"""
         if not self.dragging_icon:
             self.hovered_icon = None
-            panel_rect = pygame.Rect(self.x, 0, self.width, self.height)
-            if panel_rect.collidepoint(*mouse_pos):
-                # Adjust mouse Y for scrolling
-                my_adj = mouse_pos[1] + self.scroll_offset
+            mx, my = mouse_pos
+            if self.x <= mx < self.x + self.width and 0 <= my < self.height:
+                # The scroll offset is applied to both the icon and the mouse Y,
+                # so it cancels out and icons are tested in panel coordinates.
                 for icon in ICONS:
-                    abs_rect = icon["rect"].copy()
-                    abs_rect.x += self.x
-                    abs_rect.y += self.scroll_offset  # Apply scroll offset
-                    if abs_rect.collidepoint(mouse_pos[0], my_adj):
+                    if icon["rect"].collidepoint(mx - self.x, my):
                         self.hovered_icon = icon
                         break
 
     def update_character_hover_states(self, mouse_pos):
         """Updated to only check bottom section with horizontal scrolling."""
-        mx, my = mouse_pos
-        is_hovering_any = False
+        hovered_index = self.character_index_at(mouse_pos) if self.open else None
         for i, char in enumerate(CHARACTERS):
-            rect_copy = char["rect"].copy()
-            # Recalculate x using the base value, index spacing, and current scroll offset
-            rect_copy.x = self.char_base_x + i * (PORTRAIT_SIZE + 10) + self.char_scroll_offset + self.x
-            rect_copy.y = 20 + self.char_section_y  # fixed vertical position within character section
-            char["hovered"] = self.open and rect_copy.collidepoint(mx, my)
-            if char["hovered"]:
-                is_hovering_any = True
-        pygame.mouse.set_cursor(HAND_CURSOR if is_hovering_any else DEFAULT_CURSOR)
-
-    def update(self):
-        # Animate panel sliding in/out more quickly
-        step = 40  # Increase step size for faster animation
+            char["hovered"] = i == hovered_index
+        self.set_cursor(HAND_CURSOR if hovered_index is not None else DEFAULT_CURSOR)
+
+    def update(self, mouse_pos=None):
+        # Animate panel sliding in/out more quickly. This runs once per simulation
+        # step, so the distance is scaled to keep the speed the same at any sim rate.
+        step = 40 * sim_clock.tick_scale  # Increase step size for faster animation
         if abs(self.x - self.goal_x) < step:
             self.x = self.goal_x  # Snap to final position if very close
         elif self.x < self.goal_x:
@@ -286,12 +295,14 @@ class InventoryPanel:
         
         # Update hover states for icons & characters
         if self.open:
-            mouse_pos = pygame.mouse.get_pos()
+            if mouse_pos is None:
+                mouse_pos = pygame.mouse.get_pos()
             self.update_icon_hover_states(mouse_pos)
             self.update_character_hover_states(mouse_pos)
 
     def draw_tooltip(self, surface, mouse_pos):
         """Draw a tooltip with item name/description if hovered."""
+        self.tooltip_rect = None
         if not self.hovered_icon:
             return
         item_type = self.hovered_icon["type"]
@@ -301,10 +312,9 @@ class InventoryPanel:
         name_txt = meta["name"]
         desc_txt = meta.get("description", "")
         
-        # Create surfaces for text
-        font = pygame.font.SysFont(None, 24)
-        name_surf = font.render(name_txt, True, (255, 255, 255))
-        desc_surf = font.render(desc_txt, True, (200, 200, 200))
+        # Text surfaces come from the shared text cache
+        name_surf = render_text(name_txt, 24, (255, 255, 255))
+        desc_surf = render_text(desc_txt, 24, (200, 200, 200))
         
         # Decide tooltip size
         padding = 8
@@ -330,11 +340,13 @@ class InventoryPanel:
         pygame.draw.rect(surface, (40, 40, 40), tooltip_rect, border_radius=5)
         pygame.draw.rect(surface, (180, 180, 180), tooltip_rect, 1, border_radius=5)
         
+        self.tooltip_rect = tooltip_rect
         surface.blit(name_surf, (tooltip_rect.x + padding, tooltip_rect.y + padding))
         surface.blit(desc_surf, (tooltip_rect.x + padding, 
                                  tooltip_rect.y + padding + name_surf.get_height()))
 
-    def draw(self, surface):
+    def _render_panel_body(self):
+        """Render the static panel background (done once)."""
         # Create a surface to draw the semi-transparent panel
         panel_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
 
@@ -359,84 +371,99 @@ class InventoryPanel:
                 1
             )
 
-        # Now blit this panel_surf onto the main surface at (self.x, 0)
-        surface.blit(panel_surf, (self.x, 0))
-        
+        return panel_surf
+
+    def _panel_state(self):
+        """Everything the pre-rendered panel depends on besides its position."""
+        hovered = self.hovered_icon["type"] if self.hovered_icon and not self.dragging_icon else None
+        return (self.scroll_offset, self.char_scroll_offset, hovered,
+                tuple(char["hovered"] for char in CHARACTERS))
+
+    def _render_panel(self):
+        """Redraw the panel (in panel coordinates) on top of the pre-rendered body."""
+        panel = self.panel_body.copy()
+
         # Draw "Level Elements" title (scrolls with content)
-        font = pygame.font.SysFont(None, 28)
-        title_surf = font.render("Level Elements", True, (255, 255, 255))
-        title_rect = title_surf.get_rect(x=self.x + 10, y=10 + self.scroll_offset)
-        surface.blit(title_surf, title_rect)
+        title_surf = render_text("Level Elements", 28, (255, 255, 255))
+        panel.blit(title_surf, (10, 10 + self.scroll_offset))
 
         # Draw inventory icons with scroll offset
         for icon in ICONS:
-            rect_copy = icon["rect"].copy()
-            rect_copy.x += self.x
-            rect_copy.y += self.scroll_offset  # Apply scrolling
-            
+            rect = icon["rect"]
+            y = rect.y + self.scroll_offset  # Apply scrolling
+
             # Only draw if visible in viewport
-            if rect_copy.bottom > 0 and rect_copy.top < self.char_section_y:
+            if y + rect.height > 0 and y < self.char_section_y:
                 if icon == self.hovered_icon and not self.dragging_icon:
                     # Use the same magenta hue as with drag for consistent UX
-                    hover_texture = self.textures[icon["type"]].copy()
-                    overlay = pygame.Surface(hover_texture.get_size(), pygame.SRCALPHA)
-                    overlay.fill((255, 0, 255, 128))  # semi-transparent magenta
-                    hover_texture.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                    surface.blit(hover_texture, rect_copy)
-                
-                surface.blit(self.textures[icon["type"]], rect_copy)
-            
-            # Remove border – no more pygame.draw.rect(...) around icons
+                    hover_texture = assets.tinted(self.textures[icon["type"]], (255, 0, 255, 128))
+                    panel.blit(hover_texture, (rect.x, y))
+
+                panel.blit(self.textures[icon["type"]], (rect.x, y))
 
         # Draw "Characters" title above the section
-        char_title_surf = font.render("Characters", True, (255, 255, 255))
+        char_title_surf = render_text("Characters", 28, (255, 255, 255))
         char_title_rect = char_title_surf.get_rect(
-            centerx=self.x + self.width//2,
+            centerx=self.width//2,
             y=self.char_section_y - 30
         )
-        surface.blit(char_title_surf, char_title_rect)
+        panel.blit(char_title_surf, char_title_rect)
 
         # Draw character section background
-        char_bg = pygame.Surface((self.width, self.char_section_height), pygame.SRCALPHA)
-        char_bg.fill((140, 140, 140, 200))  # Slightly darker background
-        surface.blit(char_bg, (self.x, self.char_section_y))
-        
+        panel.blit(self.char_bg, (0, self.char_section_y))
+
         # Draw character portraits
         for i, char in enumerate(CHARACTERS):
-            rect_copy = char["rect"].copy()
-            rect_copy.x = self.char_base_x + i * (PORTRAIT_SIZE + 10) + self.char_scroll_offset + self.x
-            rect_copy.y = 20 + self.char_section_y  # offset to bottom section
+            portrait_rect = pygame.Rect(self.char_base_x + i * (PORTRAIT_SIZE + 10) + self.char_scroll_offset,
+                                        20 + self.char_section_y,  # offset to bottom section
+                                        PORTRAIT_SIZE, PORTRAIT_SIZE)
             border_color = BUTTON_HOVER_COLOR if char["hovered"] else BUTTON_BORDER_COLOR
-            pygame.draw.rect(surface, border_color, rect_copy, BUTTON_BORDER_WIDTH)
-            surface.blit(char["portrait"], rect_copy)
-        
+            pygame.draw.rect(panel, border_color, portrait_rect, BUTTON_BORDER_WIDTH)
+            panel.blit(char["portrait"], portrait_rect)
+        return panel
+
+    def draw(self, surface):
+        state = self._panel_state()
+        if state != self.panel_cache_state:
+            self.panel_cache = self._render_panel()
+            self.panel_cache_state = state
+        surface.blit(self.panel_cache, (self.x, 0))
+
         # If dragging, update ghost drawing for slides too
+        self.ghost_rect = None
         if self.dragging_icon:
             mx, my = pygame.mouse.get_pos()
             w = self.dragging_icon["rect"].width
             h = self.dragging_icon["rect"].height
             draw_rect = pygame.Rect(mx - w//2, my - h//2, w, h)
             
-            # Create magenta-tinted version of texture for all items
-            ghost_texture = self.textures[self.dragging_icon["type"]].copy()
-            overlay = pygame.Surface(ghost_texture.get_size(), pygame.SRCALPHA)
-            overlay.fill((255, 0, 255, 128))  # semi-transparent magenta
-            ghost_texture.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            # Magenta-tinted version of texture for all items (cached)
+            ghost_texture = assets.tinted(self.textures[self.dragging_icon["type"]], (255, 0, 255, 128))
             surface.blit(ghost_texture, draw_rect)
+            self.ghost_rect = draw_rect
 
         # Finally, draw tooltip if hovering
         mouse_pos = pygame.mouse.get_pos()
         self.draw_tooltip(surface, mouse_pos)
 
-    def handle_event(self, event, level, player):
+    def dirty_rects(self):
+        """Return the screen areas painted by the last draw(), for dirty rectangle presentation."""
+        rects = [pygame.Rect(self.x, 0, self.width, self.height)]
+        if self.ghost_rect is not None:
+            rects.append(self.ghost_rect)
+        if self.tooltip_rect is not None:
+            rects.append(self.tooltip_rect)
+        return rects
+
+    def handle_event(self, event, level, player, mouse_pos=None):
         # Only process if we are open
         if not self.open:
-            pygame.mouse.set_cursor(DEFAULT_CURSOR)
+            self.set_cursor(DEFAULT_CURSOR)
             return
         
         if event.type == pygame.MOUSEWHEEL:
             if self.open:
-                mx, my = pygame.mouse.get_pos()
+                mx, my = mouse_pos if mouse_pos is not None else pygame.mouse.get_pos()
                 if my >= self.char_section_y:
                     # Scroll horizontally for character selection
                     self.char_scroll_offset -= event.y * self.scroll_speed
@@ -448,27 +475,18 @@ class InventoryPanel:
         
         # Process character clicks (if applicable)
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            for i, char in enumerate(CHARACTERS):
-                rect_copy = char["rect"].copy()
-                rect_copy.x = self.char_base_x + i * (PORTRAIT_SIZE + 10) + self.char_scroll_offset + self.x
-                rect_copy.y = 20 + self.char_section_y
-                if rect_copy.collidepoint(event.pos):
-                    sound_data = {
-                        "ouch_sound": char["ouch_sound"],
-                        "boing_sound": char["boing_sound"],
-                        "portal_sound": char["portal_sound"]
-                    }
-                    player.change_character(char["sprite"], sound_data)
-                    return
+            char_index = self.character_index_at(event.pos)
+            if char_index is not None:
+                char = CHARACTERS[char_index]
+                player.change_character(char["sprite"], char["voice"])
+                return
             
             # Check if clicked on any icon in the panel.
             mx, my = event.pos
             for icon in ICONS:
-                abs_rect = icon["rect"].copy()
-                abs_rect.x += self.x
-                if abs_rect.collidepoint(mx, my):
+                if icon["rect"].collidepoint(mx - self.x, my):
                     # For any icon, assign its type as the active tool.
-                    level.current_tool = icon["type"]
+                    level.select_tool(icon["type"], (self.x, 0, self.width, self.height))
                     self.dragging_icon = icon  # for drag-drop behavior
                     break
 
@@ -477,24 +495,6 @@ class InventoryPanel:
                 mx, my = event.pos
                 panel_rect = pygame.Rect(self.x, 0, self.width, self.height)
                 if not panel_rect.collidepoint(mx, my):
-                    if self.dragging_icon["type"] == "platform":
-                        level.add_platform(mx, my)
-                    elif self.dragging_icon["type"] == "slide":
-                        level.add_slide(mx, my)
-                    elif self.dragging_icon["type"] == "trampoline":
-                        level.add_trampoline(mx, my)
-                    elif self.dragging_icon["type"] == "portal":
-                        level.add_portal(mx, my)
-                    elif self.dragging_icon["type"] == "enemy1":
-                        level.add_enemy(mx, my, 1)
-                    elif self.dragging_icon["type"] == "enemy2":
-                        level.add_enemy(mx, my, 2)
-                    elif self.dragging_icon["type"] == "spaghetti_monster":
-                        level.add_enemy(mx, my, "spaghetti_monster")
-                    elif self.dragging_icon["type"] == "elevator":
-                        level.add_elevator(mx, my)
-                    elif self.dragging_icon["type"] == "star":
-                        level.add_star(mx, my)
-                    elif self.dragging_icon["type"] == "trash":
-                        level.add_trash(mx, my)
+                    # A single item, or the region/line fill dragged out with Ctrl/Alt held.
+                    level.drop_item(self.dragging_icon["type"], mx, my)
                 self.dragging_icon = None 
\ No newline at end of file
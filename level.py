@@ -1,30 +1,49 @@
 import pygame
 import math
+from functools import partial
 from slide import SlidePlatform
 from enemy import Enemy
-from elevator import Elevator, ElevatorPoint
+from elevator import Elevator
 from star import Star
-from game_platform import Ground, StonePlatform
+from game_platform import Platform, Ground, StonePlatform
 from trampoline import Trampoline
+from confetti import ConfettiPool
+from collision import CollisionWorld
+from registry import EntityRegistry
+from pick_index import PickIndex, SLIDE_HOVER_KINDS
+from placement import ITEM_FACTORIES, register_item, region_positions, line_positions
+from projectiles import ProjectileSystem
+from bullet import BulletPool
+from enemy_batch import EnemyBatch
 from draggable import Draggable  # For draggable functionality
+from assets import assets
+from fonts import render_text
 
 BLUE = (0, 0, 255)
 LILA = (200, 0, 200)  # New color for trampoline
 
+# Item types that are drawn onto the cached static layer.
+STATIC_TYPES = (Platform, SlidePlatform, Trampoline)
+# Entity kinds kept by the level's registry (each is also a Level attribute).
+ENTITY_KINDS = ("platforms", "slides", "trampolines", "portals", "enemies", "elevators", "stars", "trashes")
+# Registry kinds drawn onto the cached static layer.
+STATIC_KINDS = ("platforms", "slides", "trampolines")
+TRAMPOLINE_WIDTH = int(40 * (363/198))
+# Outline of a region or line fill while it is being dragged.
+FILL_PREVIEW_COLOR = (255, 255, 255)
+
 class Portal(Draggable):
     def __init__(self, x, y, is_entrance=True, portal_id=1):
         Draggable.__init__(self)
         if is_entrance:
-            self.image = pygame.image.load('images/portal_entry.png').convert_alpha()
+            self.image = assets.image('images/portal_entry.png', (60, 120))
         else:
-            self.image = pygame.image.load('images/portal_exit.png').convert_alpha()
-        self.image = pygame.transform.smoothscale(self.image, (60, 120))
+            self.image = assets.image('images/portal_exit.png', (60, 120))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.is_entrance = is_entrance
         self.portal_id = portal_id
-        self.font = pygame.font.SysFont(None, 24)
 
     def draw(self, surface):
         if self.being_dragged:
@@ -32,65 +51,166 @@ class Portal(Draggable):
             surface.blit(tinted, self.rect)
         else:
             surface.blit(self.image, self.rect)
-        text = self.font.render(str(self.portal_id), True, (255, 255, 255))
+        text = render_text(str(self.portal_id), 24, (255, 255, 255))
         text_rect = text.get_rect(center=self.rect.center)
         surface.blit(text, text_rect)
 
+# Factories for everything the inventory can place; see placement.py.
+@register_item("platform", "platforms", footprint=(225, 30))
+def _new_platform(level, x, y):
+    return [StonePlatform(x - 112, y - 15, 225, 30)]
+
+@register_item("slide", "slides", footprint=(200, 200))
+def _new_slide(level, x, y):
+    return [SlidePlatform(start_x=x, start_y=y, end_x=x - 200, end_y=y + 200)]
+
+@register_item("trampoline", "trampolines", footprint=(TRAMPOLINE_WIDTH, 40))
+def _new_trampoline(level, x, y):
+    return [Trampoline(x - TRAMPOLINE_WIDTH // 2, y - 20, TRAMPOLINE_WIDTH, 40)]
+
+@register_item("portal", "portals", footprint=(125, 120))
+def _new_portal_pair(level, x, y):
+    entrance = Portal(x - 15, y - 30, is_entrance=True, portal_id=level.next_portal_id)
+    exit_portal = Portal(x + 50, y - 30, is_entrance=False, portal_id=level.next_portal_id)
+    level.portal_pairs[entrance] = exit_portal
+    level.portal_pairs[exit_portal] = entrance
+    level.next_portal_id += 1
+    return [entrance, exit_portal]
+
+def _new_enemy(level, x, y, enemy_type):
+    return [Enemy(x - 60, y - 60, enemy_type)]
+
+for _item_type, _enemy_type in (("enemy1", 1), ("enemy2", 2), ("spaghetti_monster", "spaghetti_monster")):
+    register_item(_item_type, "enemies", footprint=(120, 120))(partial(_new_enemy, enemy_type=_enemy_type))
+
+@register_item("elevator", "elevators", footprint=(112, 230))
+def _new_elevator(level, x, y):
+    elevator = Elevator(x, y, level.next_elevator_id)
+    level.next_elevator_id += 1
+    return [elevator]
+
+@register_item("star", "stars", footprint=(40, 40))
+def _new_star(level, x, y):
+    return [Star(x, y)]
+
+@register_item("trash", "trashes", footprint=(40, 40))
+def _new_trash(level, x, y):
+    from trash import Trash  # Import inside the function to avoid circular imports
+    return [Trash(x, y)]
+
 class Level:
-    def __init__(self, builder_mode=False):
-        screen = pygame.display.get_surface()
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
+    def __init__(self, builder_mode=False, world_size=None, batch_enemies=False, default_layout=True):
+        # The world is as large as the screen unless a size is given (e.g. headless simulation).
+        if world_size is None:
+            world_size = pygame.display.get_surface().get_size()
+        screen_width, screen_height = world_size
+        self.size = (screen_width, screen_height)
+
+        # Cached "static layer": background, overlay and static geometry,
+        # only redrawn after the level was edited.
+        self.background = None
+        self.overlay = None
+        self.static_layer = None
+        self.static_dirty = True
+        
+        # Every entity gets an id in the registry; the per-kind lists are views of it.
+        self.entities = EntityRegistry(ENTITY_KINDS)
+        self.platforms = self.entities.collections["platforms"]
+        self.slides = self.entities.collections["slides"]
+        self.trampolines = self.entities.collections["trampolines"]
+        self.portals = self.entities.collections["portals"]
+        self.enemies = self.entities.collections["enemies"]
+        self.elevators = self.entities.collections["elevators"]
+        self.stars = self.entities.collections["stars"]
+        self.trashes = self.entities.collections["trashes"]
+
+        # Long-lived collision world (platforms and elevator platforms), updated as the level changes.
+        self.collision_world = CollisionWorld()
+        # Grid index of everything the mouse can click, updated as the level changes.
+        self.pick_index = PickIndex(self)
+        # The slide under the mouse; only looked up again after the mouse moved or the level changed.
+        self.hovered_slide = None
+        self.hover_stale = True
+        self.hover_version = None
+
+        self.portal_pairs = {}  # Each portal maps to the other portal of its pair
+        self.next_portal_id = 1
+        
+        self.dragging_item = None
+        
+        self.next_elevator_id = 1
+        # Set once trash has been placed; a level without any cannot be won.
+        self.trash_placed = False
+        self.elevator_prev_positions = {}
+        self.bullets = []  # <--- NEW: List to track active bullets
+        self.bullet_pool = BulletPool()  # Reusable bullets (caps how many can fly at once)
+        self.projectiles = ProjectileSystem(self)  # Moves bullets and resolves their hits
         
+        # All confetti particles live in one pooled, array-based particle system
+        self.confetti = ConfettiPool()
+
+        # Optionally step autonomous enemies together with NumPy instead of one by one.
+        self.batch_enemies = batch_enemies
+        self.enemy_batch = EnemyBatch(self)
+
+        # Initialize tool state for level builder.
+        self.current_tool = None
+        # Where the current tool was picked up (the inventory panel); fills start outside it.
+        self.tool_source_rect = None
+        self.last_spray_time = 0
+        self.spray_interval = 100  # milliseconds between placements in spray mode
+        # Region (Ctrl) or line (Alt) fill being dragged out with the current tool.
+        self.fill_mode = None
+        self.fill_start = None
+        self.fill_end = None
+
+        # Levels loaded from a file (see level_file.py) start out empty.
+        if default_layout:
+            self._add_default_layout()
+
+    def _add_default_layout(self):
+        screen_width, screen_height = self.size
         # Define intended platform dimensions.
         platform_width = 225   # 1.5x original width
         platform_height = 30   # 1.5x original height
-        
+
         # Create platforms using our new classes.
-        self.platforms = [
+        self._add_batch("platforms", [
             Ground(0, screen_height - 50, screen_width),  # Ground platform
             StonePlatform(300, 600, platform_width, platform_height),
             StonePlatform(500, 500, platform_width, platform_height),
             StonePlatform(700, 450, platform_width, platform_height),
             StonePlatform(900, 400, platform_width, platform_height),
-        ]
-        
-        self.slides = [ SlidePlatform(700, 350, 500, 550) ]
-        self.portals = []  # List of Portal objects
-        self.next_portal_id = 1
-        
-        self.dragging_item = None
-        
+        ])
+
+        self._add_batch("slides", [SlidePlatform(700, 350, 500, 550)])
+
         # Create trampolines.
-        tramp_width = int(40 * (363/198))
-        self.trampolines = [ Trampoline(900, 580, tramp_width, 40) ]
-        
-        self.enemies = []
-        self.elevators = []
-        self.next_elevator_id = 1
-        self.elevator_prev_positions = {}
-        self.stars = []
-        self.trashes = []  # New list to hold Trash items
-        self.bullets = []  # <--- NEW: List to track active bullets
-        
-        # ** NEW: Initialize confetti explosions list **
-        self.confetti_explosions = []
-        
+        self._add_batch("trampolines", [Trampoline(900, 580, TRAMPOLINE_WIDTH, 40)])
+
         # Add a few default collectible stars and trash items.
         # Positions are chosen arbitrarily; adjust as desired.
         self.add_star(400, 300)
         self.add_star(800, 250)
         self.add_trash(600, 350)
         self.add_trash(750, 400)
-        
-        # Initialize tool state for level builder.
-        self.current_tool = None
-        self.last_spray_time = 0
-        self.spray_interval = 100  # milliseconds between placements in spray mode
     
-    def handle_mouse_events(self, events):
+    def handle_mouse_events(self, events, keys=None, mouse_pos=None, now=None):
+        """
+        Apply mouse editing for this frame's events.
+
+        `keys`, `mouse_pos` and `now` (ms ticks) default to the live pygame
+        state; replays pass the recorded values instead.
+        """
+        # Spray placements are collected and added as one batch per frame.
+        sprayed = []
+        spray_tool = None
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN:
+                # Items sprayed earlier in this frame can already be clicked.
+                if sprayed:
+                    self.add_many(spray_tool, sprayed)
+                    sprayed = []
                 clicked_item = self.find_clicked_item(event.pos[0], event.pos[1])
                 if clicked_item and hasattr(clicked_item, "handle_click"):
                     action = clicked_item.handle_click(event)
@@ -99,101 +219,152 @@ class Level:
                     elif action == "remove":
                         self.remove_item(clicked_item)
             elif event.type == pygame.MOUSEMOTION:
+                self.hover_stale = True
                 if self.dragging_item and isinstance(self.dragging_item, Draggable):
                     self.dragging_item.update_drag(event.pos[0], event.pos[1])
-                keys = pygame.key.get_pressed()
-                if self.current_tool is not None and (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]):
-                    now = pygame.time.get_ticks()
+                if keys is None:
+                    keys = pygame.key.get_pressed()
+                if self.current_tool is not None and self.fill_start is not None:
+                    self.fill_end = event.pos
+                elif self.current_tool is not None and (keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL] or
+                                                        keys[pygame.K_LALT] or keys[pygame.K_RALT]):
+                    # Start a fill at the first point outside the panel the tool came from;
+                    # dropping the item finishes it (see drop_item).
+                    if self.tool_source_rect is None or not self.tool_source_rect.collidepoint(event.pos):
+                        self.fill_mode = "region" if keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL] else "line"
+                        self.fill_start = self.fill_end = event.pos
+                elif self.current_tool is not None and (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]):
+                    if now is None:
+                        now = pygame.time.get_ticks()
                     if now - self.last_spray_time > self.spray_interval:
                         self.last_spray_time = now
                         import random
                         offset_x = random.randint(-5, 5)
                         offset_y = random.randint(-5, 5)
                         x, y = event.pos
-                        new_x = x + offset_x
-                        new_y = y + offset_y
-                        tool = self.current_tool
-                        if tool == "star":
-                            self.add_star(new_x, new_y)
-                        elif tool == "platform":
-                            self.add_platform(new_x, new_y)
-                        elif tool == "slide":
-                            self.add_slide(new_x, new_y)
-                        elif tool == "trampoline":
-                            self.add_trampoline(new_x, new_y)
-                        elif tool == "portal":
-                            self.add_portal(new_x, new_y)
-                        elif tool == "enemy1":
-                            self.add_enemy(new_x, new_y, 1)
-                        elif tool == "enemy2":
-                            self.add_enemy(new_x, new_y, 2)
-                        elif tool == "elevator":
-                            self.add_elevator(new_x, new_y)
-                        elif tool == "trash":
-                            self.add_trash(new_x, new_y)
+                        if self.current_tool in ITEM_FACTORIES:
+                            spray_tool = self.current_tool
+                            sprayed.append((x + offset_x, y + offset_y))
             elif event.type == pygame.MOUSEBUTTONUP:
                 if self.dragging_item and isinstance(self.dragging_item, Draggable):
                     self.dragging_item.end_drag()
                 self.dragging_item = None
-                self.current_tool = None
+                self.current_tool = self.tool_source_rect = None
+                self.fill_mode = self.fill_start = self.fill_end = None
+        if sprayed:
+            self.add_many(spray_tool, sprayed)
         
         if not self.dragging_item:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            hovered_slide = self.find_clicked_item(mouse_x, mouse_y)
-            if hovered_slide and isinstance(hovered_slide, SlidePlatform):
-                if not hasattr(hovered_slide, 'hover_timer'):
-                    hovered_slide.hover_timer = 0
-                hovered_slide.hover_timer += 1
-            for s in self.slides:
-                if s is not hovered_slide:
-                    if not hasattr(s, 'hover_timer'):
-                        s.hover_timer = 0
-                    s.hover_timer = 0
+            if self.hover_stale or self.hover_version != self.pick_index.version:
+                self.update_hovered_slide(mouse_pos)
+            if self.hovered_slide is not None:
+                self.hovered_slide.hover_timer += 1
+
+    def update_hovered_slide(self, mouse_pos=None):
+        """Look up the slide under the mouse, resetting the hover timer of the one it leaves."""
+        mouse_x, mouse_y = mouse_pos if mouse_pos is not None else pygame.mouse.get_pos()
+        hovered = self.pick_index.pick(mouse_x, mouse_y, SLIDE_HOVER_KINDS)
+        if not isinstance(hovered, SlidePlatform):
+            hovered = None
+        if hovered is not self.hovered_slide:
+            if self.hovered_slide is not None:
+                self.hovered_slide.hover_timer = 0
+            self.hovered_slide = hovered
+        self.hover_stale = False
+        self.hover_version = self.pick_index.version
+
+    def set_backdrop(self, background, overlay=None):
+        """Set the background (and optional overlay) drawn under the static layer."""
+        self.background = background
+        self.overlay = overlay
+        self.static_dirty = True
+
+    def mark_static_dirty(self):
+        self.static_dirty = True
+
+    def item_changed(self, item):
+        """Called by draggable items when they are moved, flipped or start/stop being dragged."""
+        # The item being dragged is drawn on top of the static layer,
+        # so moving it around does not require a rebuild.
+        if isinstance(item, STATIC_TYPES) and not (item.being_dragged and item is self.dragging_item):
+            self.static_dirty = True
+        self.collision_world.move_static(item)
+        self.pick_index.moved(item)
+
+    def _is_on_static_layer(self, item):
+        return not getattr(item, "being_dragged", False)
+
+    def _rebuild_static_layer(self):
+        if self.static_layer is None or self.static_layer.get_size() != self.size:
+            if self.background is not None:
+                self.static_layer = pygame.Surface(self.size)
+                if pygame.display.get_surface() is not None:
+                    self.static_layer = self.static_layer.convert()
+            else:
+                self.static_layer = pygame.Surface(self.size, pygame.SRCALPHA)
+        if self.background is not None:
+            self.static_layer.blit(self.background, (0, 0))
+        else:
+            self.static_layer.fill((0, 0, 0, 0))
+        if self.overlay is not None:
+            self.static_layer.blit(self.overlay, (0, 0))
+        for items in (self.platforms, self.slides, self.trampolines):
+            for item in items:
+                if self._is_on_static_layer(item):
+                    item.draw(self.static_layer)
+        self.static_dirty = False
+
+    def draw_static(self, surface):
+        """Blit the cached static layer, rebuilding it first if the level was edited."""
+        if self.static_dirty or self.static_layer is None:
+            self._rebuild_static_layer()
+        surface.blit(self.static_layer, (0, 0))
+
+    def moving_rects(self):
+        """Return the rects the simulation moves (enemies, elevator platforms, bullets), for interpolation."""
+        rects = [enemy.rect for enemy in self.enemies if enemy is not self.dragging_item]
+        rects.extend(elevator.platform_rect for elevator in self.elevators)
+        rects.extend(bullet.rect for bullet in self.bullets)
+        return rects
+
+    def dynamic_rects(self):
+        """Return the screen areas painted by draw(), for dirty rectangle presentation."""
+        rects = []
+        for items in (self.platforms, self.slides, self.trampolines):
+            for item in items:
+                if not self._is_on_static_layer(item):
+                    if isinstance(item, Platform):
+                        rects.append(item.get_image().get_rect(topleft=item.rect.topleft))
+                    else:
+                        rects.append(item.rect)
+        rects.extend(portal.rect for portal in self.portals)
+        rects.extend(enemy.rect for enemy in self.enemies)
+        rects.extend(elevator.get_rect() for elevator in self.elevators)
+        rects.extend(trash.rect for trash in self.trashes)
+        rects.extend(star.rect for star in self.stars if not star.collected)
+        rects.extend(bullet.rect for bullet in self.bullets)
+        confetti_rect = self.confetti.get_rect()
+        if confetti_rect is not None:
+            rects.append(confetti_rect)
+        if self.fill_start is not None:
+            rects.append(self.fill_area().inflate(4, 4))
+        return rects
+
+    def fill_area(self):
+        """Return the rect spanned by the fill being dragged out."""
+        (x1, y1), (x2, y2) = self.fill_start, self.fill_end
+        return pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
 
     def find_clicked_item(self, mouse_x, mouse_y):
-        # Check stone platforms (skip the ground if desired)
-        for p in self.platforms[1:]:
-            if p.rect.collidepoint(mouse_x, mouse_y):
-                return p
-        # Check trampolines
-        for tramp in self.trampolines:
-            if tramp.rect.collidepoint(mouse_x, mouse_y):
-                return tramp
-        # Check slides (including if the click is on the flip icon)
-        for s in self.slides:
-            if s.contains_point(mouse_x, mouse_y, threshold=8) or s.flip_icon_contains_point(mouse_x, mouse_y):
-                return s
-        # Check portals
-        for portal in self.portals:
-            if portal.rect.collidepoint(mouse_x, mouse_y):
-                return portal
-        # Check enemies
-        for enemy in self.enemies:
-            if enemy.rect.collidepoint(mouse_x, mouse_y):
-                return enemy
-        # Check elevator points
-        for elevator in self.elevators:
-            if elevator.start_point.rect.collidepoint(mouse_x, mouse_y):
-                return elevator.start_point
-            if elevator.end_point.rect.collidepoint(mouse_x, mouse_y):
-                return elevator.end_point
-        # Check stars
-        for star in self.stars:
-            if star.rect.collidepoint(mouse_x, mouse_y) and not star.collected:
-                return star
-        # Check trash items
-        for trash in self.trashes:
-            if trash.rect.collidepoint(mouse_x, mouse_y):
-                return trash
-        return None
+        """Return the topmost editable item at the mouse position, or None."""
+        return self.pick_index.pick(mouse_x, mouse_y)
 
     def draw(self, surface):
-        for platform in self.platforms:
-            platform.draw(surface)
-        for slide in self.slides:
-            slide.draw(surface)
-        for tramp in self.trampolines:
-            tramp.draw(surface)
+        """Draw everything that is not on the static layer (see draw_static)."""
+        for items in (self.platforms, self.slides, self.trampolines):
+            for item in items:
+                if not self._is_on_static_layer(item):
+                    item.draw(surface)
         for portal in self.portals:
             portal.draw(surface)
         for enemy in self.enemies:
@@ -208,133 +379,180 @@ class Level:
         for bullet in self.bullets:
             bullet.draw(surface)
         # --- NEW: Draw confetti explosions ---
-        for explosion in self.confetti_explosions:
-            explosion.draw(surface)
+        self.confetti.draw(surface)
+        if self.fill_start is not None:
+            if self.fill_mode == "line":
+                pygame.draw.line(surface, FILL_PREVIEW_COLOR, self.fill_start, self.fill_end, 2)
+            else:
+                pygame.draw.rect(surface, FILL_PREVIEW_COLOR, self.fill_area(), 2)
 
     def remove_item(self, item):
-        if item in self.platforms:
-            self.platforms.remove(item)
-        elif item in self.trampolines:
-            self.trampolines.remove(item)
-        elif item in self.slides:
-            self.slides.remove(item)
-        elif item in self.portals:
-            portal_id = item.portal_id
-            self.portals = [p for p in self.portals if p.portal_id != portal_id]
-        elif isinstance(item, Enemy):
-            self.enemies.remove(item)
-        elif isinstance(item, ElevatorPoint):
-            for elevator in self.elevators[:]:
-                if item in [elevator.start_point, elevator.end_point]:
-                    self.elevators.remove(elevator)
-                    break
-        elif item in self.stars:
-            self.stars.remove(item)
-        elif item in self.trashes:  # New clause for trash
-            self.trashes.remove(item)
+        if isinstance(item, STATIC_TYPES):
+            self.static_dirty = True
+        # Elevator end points stand for their elevator; portals go with their pair.
+        kind, entity = self._forget(item)
+        if kind == "portals":
+            pair = self.portal_pairs.pop(entity, None)
+            if pair is not None:
+                del self.portal_pairs[pair]
+                self._forget(pair)
         if self.dragging_item == item:
             self.dragging_item = None
 
+    def add_many(self, item_type, positions):
+        """
+        Place one `item_type` item (e.g. "platform", "enemy1") at each (x, y)
+        in `positions`. The registry, collision world, pick index and static
+        layer are updated once for the whole batch. Returns the new entities.
+        """
+        factory = ITEM_FACTORIES[item_type]
+        build = factory.build
+        entities = []
+        for x, y in positions:
+            entities.extend(build(self, x, y))
+        return self._add_batch(factory.kind, entities)
+
+    def fill(self, item_type, mode, start, end):
+        """Place items over the rectangle (mode "region") or along the line ("line") from `start` to `end`."""
+        footprint = ITEM_FACTORIES[item_type].footprint
+        if mode == "line":
+            positions = line_positions(start, end, footprint)
+        else:
+            positions = region_positions(start, end, footprint)
+        return self.add_many(item_type, positions)
+
+    def select_tool(self, item_type, source_rect=None):
+        """Start dragging `item_type` in from `source_rect` (e.g. the inventory panel)."""
+        self.current_tool = item_type
+        self.tool_source_rect = pygame.Rect(source_rect) if source_rect is not None else None
+
+    def drop_item(self, item_type, x, y):
+        """Place an item dropped from the inventory, or finish the fill dragged out with it."""
+        if self.fill_start is not None:
+            return self.fill(item_type, self.fill_mode, self.fill_start, (x, y))
+        return self.add_many(item_type, [(x, y)])
+
+    def _add_batch(self, kind, entities):
+        """Register new entities of one kind and add them to the collision world, pick index and static layer."""
+        if kind == "elevators":
+            # Elevators are picked and removed through their end points.
+            for elevator in entities:
+                self.entities.add(kind, elevator, (elevator.start_point, elevator.end_point))
+                elevator.start_point.owner = elevator.end_point.owner = self
+        else:
+            self.entities.add_many(kind, entities)
+        for entity in entities:
+            entity.owner = self
+        if kind == "platforms":
+            self.collision_world.add_static_many(entities)
+        elif kind == "elevators":
+            self.collision_world.add_kinematic_many(entities)
+        self.pick_index.add_many(kind, entities)
+        if kind == "trashes" and entities:
+            self.trash_placed = True
+        if kind in STATIC_KINDS:
+            self.static_dirty = True
+        return entities
+
+    def _forget(self, item):
+        """Unregister an entity (or the one `item` is part of); returns its (kind, entity)."""
+        kind, entity = self.entities.remove(item)
+        if kind == "platforms":
+            self.collision_world.remove_static(entity)
+        elif kind == "elevators":
+            self.collision_world.remove_kinematic(entity)
+        if kind is not None:
+            self.pick_index.remove(kind, entity)
+        return kind, entity
+
     def add_platform(self, x, y):
-        new_platform = StonePlatform(x - 112, y - 15, 225, 30)
-        self.platforms.append(new_platform)
+        self.add_many("platform", [(x, y)])
 
     def add_slide(self, x, y):
-        new_slide = SlidePlatform(start_x=x, start_y=y, end_x=x - 200, end_y=y + 200)
-        self.slides.append(new_slide)
+        self.add_many("slide", [(x, y)])
 
     def add_trampoline(self, x, y):
-        tramp_width = int(40 * (363/198))
-        new_tramp = Trampoline(x - tramp_width // 2, y - 20, tramp_width, 40)
-        self.trampolines.append(new_tramp)
+        self.add_many("trampoline", [(x, y)])
 
     def add_portal(self, x, y):
-        entrance = Portal(x - 15, y - 30, is_entrance=True, portal_id=self.next_portal_id)
-        exit_portal = Portal(x + 50, y - 30, is_entrance=False, portal_id=self.next_portal_id)
-        self.portals.extend([entrance, exit_portal])
-        self.next_portal_id += 1
+        self.add_many("portal", [(x, y)])
 
     def find_portal_pair(self, portal):
-        for p in self.portals:
-            if p.portal_id == portal.portal_id and p.is_entrance != portal.is_entrance:
-                return p
-        return None
+        return self.portal_pairs.get(portal)
+
+    def trampolines_near(self, rect):
+        """Return the trampolines that may overlap `rect` (trampolines are clicked on their rects)."""
+        return self.pick_index.near("trampolines", rect)
+
+    def fire_bullet(self, x, y, direction):
+        """Spawn a pooled bullet; returns False if too many bullets are already flying."""
+        bullet = self.bullet_pool.spawn(x, y, direction)
+        if bullet is None:
+            return False
+        self.bullets.append(bullet)
+        return True
 
     def add_enemy(self, x, y, enemy_type):
-        x = x - 60
-        y = y - 60
-        self.enemies.append(Enemy(x, y, enemy_type))
+        self._add_batch("enemies", _new_enemy(self, x, y, enemy_type))
 
     def add_elevator(self, x, y):
-        new_elevator = Elevator(x, y, self.next_elevator_id)
-        self.elevators.append(new_elevator)
-        self.next_elevator_id += 1
+        self.add_many("elevator", [(x, y)])
 
     def add_star(self, x, y):
-        self.stars.append(Star(x, y))
+        self.add_many("star", [(x, y)])
 
     def add_trash(self, x, y):
-        from trash import Trash  # Import inside the method to avoid circular imports
-        new_trash = Trash(x, y)
-        self.trashes.append(new_trash)
+        self.add_many("trash", [(x, y)])
 
     def update(self, player):
         elevator_movements = {}
         for elevator in self.elevators:
-            other_platforms = self.platforms.copy()
-            other_platforms += [e.platform_rect for e in self.elevators if e != elevator]
+            # Only look at what the platform can reach with this step.
+            reach = elevator.step_length() + 2
+            area = elevator.platform_rect.inflate(2 * reach, 2 * reach)
+            nearby = self.collision_world.colliders_near(area, exclude=elevator)
             prev_pos = elevator.platform_rect.center
-            elevator.update(other_platforms)
+            elevator.update(nearby)
             current_pos = elevator.platform_rect.center
+            if current_pos != prev_pos:
+                self.collision_world.move_kinematic(elevator)
             elevator_movements[elevator] = (current_pos[0] - prev_pos[0], current_pos[1] - prev_pos[1])
-        for enemy in self.enemies:
-            enemy.update(self.platforms, self, elevator_movements)
-        for star in self.stars[:]:
+        if self.batch_enemies:
+            self.enemy_batch.update(elevator_movements)
+        else:
+            for enemy in self.enemies:
+                enemy.update(self, elevator_movements)
+        for star in list(self.stars):
             if not star.collected and player.rect.colliderect(star.rect):
                 star.collected = True
                 player.stars_collected += 1
                 player.star_sound.play()
-                self.stars.remove(star)
+                self._forget(star)
         
         # --- NEW: Update bullets ---
-        screen_obj = pygame.display.get_surface()
-        screen_width, screen_height = screen_obj.get_width(), screen_obj.get_height()
-        for bullet in self.bullets[:]:
-            bullet.update()
-            # Remove bullet if off screen
-            if bullet.is_off_screen(screen_width, screen_height):
-                self.bullets.remove(bullet)
-                continue
-            # Remove bullet if it hits a platform
-            for platform in self.platforms:
-                if bullet.rect.colliderect(platform.rect):
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                    break
-            else:
-                # Check collision with enemies
-                for enemy in self.enemies[:]:
-                    if bullet.rect.colliderect(enemy.rect):
-                        # Create a massive explosion using 100 particles
-                        from confetti import ConfettiExplosion
-                        explosion = ConfettiExplosion(enemy.rect.center, num_particles=100)
-                        self.confetti_explosions.append(explosion)
-                        self.enemies.remove(enemy)
-                        if bullet in self.bullets:
-                            self.bullets.remove(bullet)
-                        break
-                        
+        screen_width, screen_height = self.size
+        self.projectiles.update(screen_width, screen_height)
+
         # --- Update confetti explosions ---
-        for explosion in self.confetti_explosions[:]:
-            explosion.update()
-            if explosion.is_finished():
-                self.confetti_explosions.remove(explosion)
+        self.confetti.update()
                 
         # --- End bullet update ---
         return elevator_movements
 
+    def all_trash_collected(self):
+        """True once the trash placed in the level is gone (never for a level that had none)."""
+        return self.trash_placed and not self.trashes
+
+    def collect_trash(self, player):
+        """Collect the trash items the player touches; returns how many were collected."""
+        collected = [trash for trash in self.trashes if player.rect.colliderect(trash.rect)]
+        for trash in collected:
+            self._forget(trash)
+        player.trash_collected += len(collected)
+        return len(collected)
+
     def check_collisions(self, player_rect):
-        for platform in self.platforms:
+        for platform in self.collision_world.static_near(player_rect):
             if player_rect.colliderect(platform.rect):
                 return True
         return False
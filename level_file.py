@@ -0,0 +1,316 @@
+"""
+Saving and loading levels.
+
+A level file stores every entity of a Level as a record of integers, with
+one record layout per kind (see FIELDS). There are two encodings of the
+same records:
+
+* JSON (".json"): readable and easy to edit by hand, one object per entity.
+* Binary (any other extension, e.g. ".lvl"): a small header followed by a
+  zlib-compressed block of little-endian int32 records, one run per kind.
+
+load_level() tells the encodings apart by the file's first bytes and
+builds the entities of each kind in one batch, so big levels load fast.
+"""
+import gc
+import json
+import struct
+import zlib
+from operator import itemgetter
+import pygame
+from elevator import Elevator
+from enemy import Enemy
+from game_platform import Ground, StonePlatform
+from level import ENTITY_KINDS, Level, Portal
+from slide import SlidePlatform
+from star import Star
+from trampoline import Trampoline
+from trash import Trash
+
+LEVEL_FORMAT = "platformer-level"
+LEVEL_VERSION = 1
+MAGIC = b"PLVL"
+# Magic, version, world width and height.
+HEADER = struct.Struct("<4sHII")
+COUNT = struct.Struct("<I")
+
+# The integer fields saved for each kind, in record order. Positions are
+# top-left corners, except for stars and trash (centres) and slides
+# (their end points).
+FIELDS = {
+    "platforms": ("type", "x", "y", "width", "height"),
+    "slides": ("start_x", "start_y", "end_x", "end_y", "flipped"),
+    "trampolines": ("x", "y", "width", "height"),
+    "portals": ("portal_id", "entrance_x", "entrance_y", "exit_x", "exit_y"),
+    "enemies": ("type", "x", "y"),
+    "elevators": ("elevator_id", "start_x", "start_y", "end_x", "end_y"),
+    "stars": ("x", "y"),
+    "trashes": ("x", "y"),
+}
+# Binary type codes and their JSON names.
+PLATFORM_TYPES = {0: "ground", 1: "stone"}
+ENEMY_TYPES = {1: 1, 2: 2, 3: "spaghetti_monster"}
+TYPE_NAMES = {"platforms": PLATFORM_TYPES, "enemies": ENEMY_TYPES}
+TYPE_CODES = {kind: {name: code for code, name in names.items()} for kind, names in TYPE_NAMES.items()}
+
+
+class LevelData:
+    """The records of a saved level, by kind, plus the world size it was built for."""
+
+    def __init__(self, world_size, records=None):
+        self.world_size = tuple(world_size)
+        self.records = records if records is not None else {kind: [] for kind in ENTITY_KINDS}
+
+    def __eq__(self, other):
+        return (isinstance(other, LevelData) and self.world_size == other.world_size
+                and self.records == other.records)
+
+
+# --- Level <-> records ---
+
+def level_data(level):
+    """Return the LevelData of everything currently in `level`."""
+    records = {kind: [] for kind in ENTITY_KINDS}
+    records["platforms"] = [(0 if isinstance(p, Ground) else 1, p.rect.x, p.rect.y, p.rect.width, p.rect.height)
+                            for p in level.platforms]
+    records["slides"] = [(s.start_x, s.start_y, s.end_x, s.end_y, int(s.is_flipped)) for s in level.slides]
+    records["trampolines"] = [tuple(t.rect) for t in level.trampolines]
+    for portal in level.portals:
+        exit_portal = level.portal_pairs.get(portal)
+        if portal.is_entrance and exit_portal is not None:
+            records["portals"].append((portal.portal_id, portal.rect.x, portal.rect.y,
+                                       exit_portal.rect.x, exit_portal.rect.y))
+    enemy_codes = TYPE_CODES["enemies"]
+    records["enemies"] = [(enemy_codes[e.enemy_type], e.rect.x, e.rect.y) for e in level.enemies]
+    records["elevators"] = [(e.elevator_id, e.start_point.rect.x, e.start_point.rect.y,
+                             e.end_point.rect.x, e.end_point.rect.y) for e in level.elevators]
+    records["stars"] = [s.rect.center for s in level.stars]
+    records["trashes"] = [t.rect.center for t in level.trashes]
+    return LevelData(level.size, records)
+
+
+def _copy(prototype, **attributes):
+    """
+    Return a copy of `prototype` with `attributes` (such as its rect) set,
+    without running its constructor. Used for entities whose only other
+    state is shared images (from the asset cache) and plain values.
+    """
+    entity = object.__new__(type(prototype))
+    entity.__dict__.update(prototype.__dict__)
+    entity.__dict__.update(attributes)
+    return entity
+
+
+def _centred(prototype, rows):
+    entities = []
+    for x, y in rows:
+        rect = prototype.rect.copy()
+        rect.center = (x, y)
+        entities.append(_copy(prototype, rect=rect))
+    return entities
+
+
+def _build_platforms(rows):
+    prototypes = {}
+    platforms = []
+    for kind, x, y, width, height in rows:
+        # The texture only depends on the type and the height.
+        prototype = prototypes.get((kind, height))
+        if prototype is None:
+            cls = Ground if kind == 0 else StonePlatform
+            prototype = prototypes[kind, height] = cls(0, 0, width, height)
+        platforms.append(_copy(prototype, rect=pygame.Rect(x, y, width, height)))
+    return platforms
+
+
+def _build_slides(rows):
+    prototypes = (SlidePlatform(0, 0, 0, 0), SlidePlatform(0, 0, 0, 0))
+    prototypes[1].flip()
+    slides = []
+    for start_x, start_y, end_x, end_y, flipped in rows:
+        prototype = prototypes[1 if flipped else 0]
+        rect = prototype.texture.get_rect(center=((start_x + end_x) // 2, (start_y + end_y) // 2))
+        # The flip icon sits in the corner the slide starts from.
+        icon_rect = prototype.flip_icon_rect.copy()
+        if flipped:
+            icon_rect.topright = rect.topright
+        else:
+            icon_rect.topleft = rect.topleft
+        slides.append(_copy(prototype, rect=rect, start_x=start_x, start_y=start_y, end_x=end_x, end_y=end_y,
+                            flip_icon_rect=icon_rect))
+    return slides
+
+
+def _build_trampolines(rows):
+    prototypes = {}
+    trampolines = []
+    for x, y, width, height in rows:
+        prototype = prototypes.get((width, height))
+        if prototype is None:
+            prototype = prototypes[width, height] = Trampoline(0, 0, width, height)
+        trampolines.append(_copy(prototype, rect=pygame.Rect(x, y, width, height)))
+    return trampolines
+
+
+def _build_portals(level, rows):
+    entrance_prototype = Portal(0, 0, is_entrance=True)
+    exit_prototype = Portal(0, 0, is_entrance=False)
+    portals = []
+    for portal_id, entrance_x, entrance_y, exit_x, exit_y in rows:
+        entrance = _copy(entrance_prototype, rect=entrance_prototype.rect.move(entrance_x, entrance_y))
+        exit_portal = _copy(exit_prototype, rect=exit_prototype.rect.move(exit_x, exit_y))
+        entrance.portal_id = exit_portal.portal_id = portal_id
+        level.portal_pairs[entrance] = exit_portal
+        level.portal_pairs[exit_portal] = entrance
+        portals += (entrance, exit_portal)
+    return portals
+
+
+def _build_enemies(rows):
+    prototypes = {}
+    enemies = []
+    for kind, x, y in rows:
+        prototype = prototypes.get(kind)
+        if prototype is None:
+            prototype = prototypes[kind] = Enemy(0, 0, ENEMY_TYPES[kind])
+        enemies.append(_copy(prototype, rect=prototype.rect.move(x, y)))
+    return enemies
+
+
+def _build_elevators(rows):
+    prototype = Elevator(0, 0)
+    start_prototype, end_prototype = prototype.start_point, prototype.end_point
+    elevators = []
+    for elevator_id, start_x, start_y, end_x, end_y in rows:
+        start_point = _copy(start_prototype, rect=pygame.Rect((start_x, start_y), start_prototype.rect.size),
+                            elevator_id=elevator_id)
+        end_point = _copy(end_prototype, rect=pygame.Rect((end_x, end_y), end_prototype.rect.size),
+                          elevator_id=elevator_id)
+        elevators.append(_copy(prototype, platform_rect=prototype.platform_rect.move(start_x, start_y),
+                               start_point=start_point, end_point=end_point, elevator_id=elevator_id,
+                               current_pos=pygame.Vector2(start_x, start_y)))
+    return elevators
+
+
+def build_level(data, world_size=None, batch_enemies=False):
+    """
+    Return a new Level holding the entities in `data`, sized `world_size`
+    (default: the size it was saved with). Each kind is added as one batch,
+    and simple entities are copied from a prototype instead of being
+    constructed one by one.
+    """
+    level = Level(world_size=world_size or data.world_size, batch_enemies=batch_enemies, default_layout=False)
+    records = data.records
+    # Nothing built here is garbage, but allocating this many objects would
+    # otherwise trigger several full collections.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        level._add_batch("platforms", _build_platforms(records["platforms"]))
+        level._add_batch("slides", _build_slides(records["slides"]))
+        level._add_batch("trampolines", _build_trampolines(records["trampolines"]))
+        level._add_batch("portals", _build_portals(level, records["portals"]))
+        level._add_batch("enemies", _build_enemies(records["enemies"]))
+        level._add_batch("elevators", _build_elevators(records["elevators"]))
+        level._add_batch("stars", _centred(Star(0, 0), records["stars"]))
+        level._add_batch("trashes", _centred(Trash(0, 0), records["trashes"]))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    level.next_portal_id = max((row[0] for row in records["portals"]), default=0) + 1
+    level.next_elevator_id = max((row[0] for row in records["elevators"]), default=0) + 1
+    return level
+
+
+# --- Encodings ---
+
+def encode_json(data):
+    """Readable JSON with one entity per line."""
+    lines = [f'"format": "{LEVEL_FORMAT}"', f'"version": {LEVEL_VERSION}',
+             f'"world_size": {json.dumps(list(data.world_size))}']
+    for kind in ENTITY_KINDS:
+        fields = FIELDS[kind]
+        entities = [dict(zip(fields, row)) for row in data.records[kind]]
+        if kind in TYPE_NAMES:
+            for entity in entities:
+                entity["type"] = TYPE_NAMES[kind][entity["type"]]
+        if entities:
+            lines.append(f'"{kind}": [\n  ' + ",\n  ".join(map(json.dumps, entities)) + "\n ]")
+        else:
+            lines.append(f'"{kind}": []')
+    return ("{\n " + ",\n ".join(lines) + "\n}\n").encode("utf-8")
+
+
+def decode_json(raw):
+    document = json.loads(raw)
+    if not isinstance(document, dict) or document.get("format") != LEVEL_FORMAT:
+        raise ValueError("not a level file")
+    if document.get("version") != LEVEL_VERSION:
+        raise ValueError(f"unsupported level version {document.get('version')}")
+    records = {}
+    for kind in ENTITY_KINDS:
+        values = itemgetter(*FIELDS[kind])
+        codes = TYPE_CODES.get(kind)
+        rows = []
+        for entity in document.get(kind, ()):
+            if codes is not None:
+                entity = dict(entity, type=codes[entity["type"]])
+            rows.append(tuple(map(int, values(entity))))
+        records[kind] = rows
+    return LevelData(document["world_size"], records)
+
+
+def encode_binary(data):
+    chunks = []
+    for kind in ENTITY_KINDS:
+        rows = data.records[kind]
+        values = [value for row in rows for value in row]
+        chunks.append(COUNT.pack(len(rows)))
+        chunks.append(struct.pack(f"<{len(values)}i", *values))
+    width, height = data.world_size
+    return HEADER.pack(MAGIC, LEVEL_VERSION, width, height) + zlib.compress(b"".join(chunks))
+
+
+def decode_binary(raw):
+    magic, version, width, height = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("not a level file")
+    if version != LEVEL_VERSION:
+        raise ValueError(f"unsupported level version {version}")
+    body = zlib.decompress(raw[HEADER.size:])
+    offset = 0
+    records = {}
+    for kind in ENTITY_KINDS:
+        (count,) = COUNT.unpack_from(body, offset)
+        offset += COUNT.size
+        size = len(FIELDS[kind])
+        values = struct.unpack_from(f"<{count * size}i", body, offset)
+        offset += 4 * count * size
+        # Group the flat values into one tuple per record.
+        records[kind] = list(zip(*[iter(values)] * size))
+    return LevelData((width, height), records)
+
+
+# --- Files ---
+
+def save_level(level, path):
+    """Save `level` to `path`: as JSON if it ends in ".json", in the binary encoding otherwise."""
+    data = level_data(level)
+    raw = encode_json(data) if str(path).endswith(".json") else encode_binary(data)
+    with open(path, "wb") as f:
+        f.write(raw)
+
+
+def read_level_data(path):
+    """Read the LevelData of a file in either encoding."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        return decode_binary(raw) if raw.startswith(MAGIC) else decode_json(raw)
+    except (ValueError, KeyError, TypeError, struct.error, zlib.error) as error:
+        raise ValueError(f"{path}: {error}") from error
+
+
+def load_level(path, world_size=None, batch_enemies=False):
+    """Load a level saved with save_level()."""
+    return build_level(read_level_data(path), world_size, batch_enemies)
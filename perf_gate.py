@@ -0,0 +1,223 @@
+"""
+Replay-driven performance regression gate.
+
+Replays every recorded session in a folder headless with no frame cap,
+timing the update (game logic) and draw of each frame, then compares the
+p95 times against a committed baseline. Exits with status 1 when a p95 is
+more than the tolerance above its baseline.
+
+A second, untimed pass runs under tracemalloc to report memory use: the
+net number of memory blocks the replay left allocated (from a snapshot
+diff), the peak traced memory and the number of gen-0 garbage collections
+(which track allocation churn). These are reported but do not fail the gate.
+
+Usage:
+    python perf_gate.py                      # check against the baseline
+    python perf_gate.py --update-baseline    # record a new baseline
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from assets import assets
+from benchmark import percentile
+from replay import ReplaySimulation, Session
+
+DEFAULT_SESSIONS_DIR = "perf_sessions"
+DEFAULT_BASELINE = "perf_baseline.json"
+DEFAULT_TOLERANCE = 0.20  # allowed p95 increase over the baseline (20%)
+# p95 differences below this many milliseconds are treated as noise.
+NOISE_FLOOR_MS = 0.05
+GATED_METRICS = ["update_p95_ms", "draw_p95_ms"]
+MEMORY_METRICS = ["alloc_blocks_net", "alloc_peak_kib", "gc_gen0_collections"]
+
+
+def distribution(samples, prefix):
+    values = sorted(samples)
+    return {
+        f"{prefix}_mean_ms": sum(values) / len(values) if values else 0.0,
+        f"{prefix}_p50_ms": percentile(values, 50),
+        f"{prefix}_p95_ms": percentile(values, 95),
+        f"{prefix}_p99_ms": percentile(values, 99),
+        f"{prefix}_max_ms": values[-1] if values else 0.0,
+    }
+
+
+def new_simulation(session, screen):
+    sim = ReplaySimulation(session)
+    background = pygame.Surface(session.world_size).convert()
+    background.fill((120, 170, 220))
+    sim.level.set_backdrop(background)
+    return sim
+
+
+def draw_frame(sim, screen):
+    """Draw a frame the way platformer.main does (without the HUD counters)."""
+    sim.level.draw_static(screen)
+    sim.player.draw(screen)
+    sim.player.draw_hearts(screen)
+    sim.level.draw(screen)
+    sim.inventory.draw(screen)
+
+
+def time_session(session, screen):
+    """Replay the session uncapped; returns the per-frame update and draw times in ms."""
+    sim = new_simulation(session, screen)
+    update_ms = []
+    draw_ms = []
+    clock = time.perf_counter
+    for frame in session.input_frames():
+        t0 = clock()
+        sim.step(frame)
+        t1 = clock()
+        draw_frame(sim, screen)
+        t2 = clock()
+        update_ms.append((t1 - t0) * 1000)
+        draw_ms.append((t2 - t1) * 1000)
+    return update_ms, draw_ms
+
+
+def measure_memory(session, screen):
+    """
+    Replay the session under tracemalloc; returns the net blocks it left
+    allocated, the peak traced KiB and the gen-0 collections it caused.
+    """
+    sim = new_simulation(session, screen)
+    frames = list(session.input_frames())
+    collections_before = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for frame in frames:
+            sim.step(frame)
+            draw_frame(sim, screen)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "alloc_blocks_net": blocks,
+        "alloc_peak_kib": peak / 1024,
+        "gc_gen0_collections": gc.get_stats()[0]["collections"] - collections_before,
+    }
+
+
+def run_session(path, screen, repeat):
+    session = Session.load(path)
+    # Keep the run with the lowest update p95 to reduce scheduler noise.
+    best = None
+    for _ in range(repeat):
+        update_ms, draw_ms = time_session(session, screen)
+        result = {"frames": len(session)}
+        result.update(distribution(update_ms, "update"))
+        result.update(distribution(draw_ms, "draw"))
+        if best is None or result["update_p95_ms"] < best["update_p95_ms"]:
+            best = result
+    best.update(measure_memory(session, screen))
+    return best
+
+
+def compare(name, result, baseline, tolerance):
+    """Return a list of failure messages for the gated metrics of one session."""
+    failures = []
+    for metric in GATED_METRICS:
+        if metric not in baseline:
+            continue
+        limit = max(baseline[metric] * (1 + tolerance), baseline[metric] + NOISE_FLOOR_MS)
+        if result[metric] > limit:
+            failures.append(f"{name}: {metric} {result[metric]:.3f} ms > {limit:.3f} ms "
+                            f"(baseline {baseline[metric]:.3f} ms +{tolerance:.0%})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sessions", nargs="?", default=DEFAULT_SESSIONS_DIR, help="folder of recorded sessions")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed p95 increase as a fraction (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per session (best is kept)")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.sessions, "*.rec")))
+    if not paths:
+        print(f"No sessions found in {args.sessions}")
+        return 1
+
+    pygame.init()
+    first = Session.load(paths[0])
+    screen = pygame.display.set_mode(first.world_size)
+    assets.set_textures_enabled(True)
+
+    results = {}
+    for path in paths:
+        name = os.path.basename(path)
+        results[name] = run_session(path, screen, args.repeat)
+        r = results[name]
+        print(f"{name}: {r['frames']} frames, update p95 {r['update_p95_ms']:.3f} ms, "
+              f"draw p95 {r['draw_p95_ms']:.3f} ms, net blocks {r['alloc_blocks_net']}, "
+              f"peak {r['alloc_peak_kib']:.0f} KiB, "
+              f"gen0 GCs {r['gc_gen0_collections']}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "sessions": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 1
+    with open(args.baseline) as f:
+        baseline = json.load(f)["sessions"]
+
+    failures = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name}: not in the baseline, skipped")
+            continue
+        failures.extend(compare(name, result, baseline[name], args.tolerance))
+        for metric in MEMORY_METRICS:
+            before = baseline[name].get(metric)
+            if before and result[metric] > before * (1 + args.tolerance):
+                print(f"{name}: note: {metric} went from {before:.0f} to {result[metric]:.0f}")
+
+    if failures:
+        print("FAIL")
+        for failure in failures:
+            print("  " + failure)
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
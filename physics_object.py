@@ -1,4 +1,6 @@
 import pygame
+from timestep import sim_clock
+from collision import limit_axis_move
 
 class PhysicsObject:
     GRAVITY = 0.5
@@ -11,11 +13,32 @@ class PhysicsObject:
         # Default bounce multiplier; note that Player will override its bounce behavior.
         self.bounce_multiplier = 20
 
+    def swept_rect(self):
+        """
+        Return the area this object can cover during the next physics step:
+        its rect stretched by the current velocity plus gravity, grown by its
+        own size on every side because collision corrections can push it that far.
+        Used to query only the nearby platforms from the level's spatial index.
+        """
+        scale = sim_clock.tick_scale
+        moved = self.rect.move(self.x_velocity * scale, (self.y_velocity + self.GRAVITY * scale) * scale)
+        return self.rect.union(moved).inflate(2 * self.rect.width, 2 * self.rect.height)
+
     def apply_gravity(self):
-        self.y_velocity += self.GRAVITY
+        self.y_velocity += self.GRAVITY * sim_clock.tick_scale
 
-    def update_vertical_position(self):
-        self.rect.y += self.y_velocity
+    def update_vertical_position(self, platforms=(), level=None):
+        dy = self.y_velocity * sim_clock.tick_scale
+        # Moving no further than our own height cannot skip over anything.
+        if abs(dy) <= self.rect.height:
+            self.rect.y += dy
+            return
+        # Fast moves are swept so they cannot skip over a platform (or, when falling, a trampoline).
+        targets = list(platforms)
+        if dy > 0 and level is not None:
+            targets.extend(tramp.rect for tramp in level.trampolines_near(self.swept_rect()))
+        _, dy = limit_axis_move(self.rect, 0, dy, targets)
+        self.rect.y += dy
 
     def handle_vertical_collisions(self, platforms):
         self.on_ground = False
@@ -32,7 +55,8 @@ class PhysicsObject:
                     self.y_velocity = 0
 
     def handle_horizontal_collisions(self, platforms):
-        self.rect.x += self.x_velocity
+        dx, _ = limit_axis_move(self.rect, self.x_velocity * sim_clock.tick_scale, 0, platforms)
+        self.rect.x += dx
         for platform in platforms:
             if self.rect.colliderect(platform):
                 if self.x_velocity > 0:
@@ -64,7 +88,7 @@ class PhysicsObject:
 
     def update_physics(self, platforms, trampolines, portals, level):
         self.apply_gravity()
-        self.update_vertical_position()
+        self.update_vertical_position(platforms, level)
         self.handle_vertical_collisions(platforms)
         self.handle_horizontal_collisions(platforms)
         # Note: the call to check_trampolines will invoke the overridden method if defined in a subclass.
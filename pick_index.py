@@ -0,0 +1,123 @@
+from spatial import SpatialHash
+from game_platform import Ground
+
+# Pick order, topmost first: a click goes to the first kind (and, within a
+# kind, the first placed item) whose hit test passes.
+PICK_ORDER = ("platforms", "trampolines", "slides", "portals", "enemies", "elevators", "stars", "trashes")
+# Only the kinds above slides can hide one, so hovering looks at these alone.
+SLIDE_HOVER_KINDS = PICK_ORDER[:PICK_ORDER.index("slides") + 1]
+# Enemies move every tick, so they are hit-tested directly instead of indexed.
+UNINDEXED_KINDS = ("enemies",)
+# Platforms are clicked on their rects, which the collision world's static
+# grid already indexes; the pick index uses that grid instead of its own.
+COLLISION_GRID_KINDS = ("platforms",)
+
+
+class PickIndex:
+    """
+    Spatial index of everything the mouse can click in a level.
+
+    Each kind has a grid over the items' clickable areas, kept up to date by
+    the level when items are added, removed or dragged. pick() walks the
+    kinds in PICK_ORDER and only hit-tests the items in the grid cell under
+    the mouse. `version` changes whenever the index does.
+
+    New items are only put into their kind's grid when that kind is first
+    picked from, so loading or filling a big level does not pay for grids
+    of kinds nobody clicks on yet.
+    """
+
+    def __init__(self, level):
+        self.level = level
+        self._grids = {kind: SpatialHash() for kind in PICK_ORDER
+                       if kind not in UNINDEXED_KINDS and kind not in COLLISION_GRID_KINDS}
+        for kind in COLLISION_GRID_KINDS:
+            self._grids[kind] = level.collision_world.static
+        # Per kind, the items added since its grid was last brought up to date (in order).
+        self._pending = {kind: {} for kind in self._grids if kind not in COLLISION_GRID_KINDS}
+        self._kind_of = {}
+        self.version = 0
+
+    def _targets(self, kind, entities):
+        """The clickable things of some entities: elevators are clicked by their end points."""
+        if kind == "elevators":
+            return [point for elevator in entities for point in (elevator.start_point, elevator.end_point)]
+        if kind == "platforms":
+            return [platform for platform in entities if not isinstance(platform, Ground)]
+        return list(entities)
+
+    def _area(self, kind, item):
+        if kind == "slides":
+            return item.rect.union(item.flip_icon_rect)
+        return item.rect
+
+    def _grid(self, kind):
+        """Return the grid of `kind`, first adding the items still pending for it."""
+        grid = self._grids[kind]
+        pending = self._pending.get(kind)
+        if pending:
+            if kind == "slides":
+                grid.insert_many((item, self._area(kind, item)) for item in pending)
+            else:
+                grid.insert_many((item, item.rect) for item in pending)
+            pending.clear()
+        return grid
+
+    def add(self, kind, entity):
+        self.add_many(kind, (entity,))
+
+    def add_many(self, kind, entities):
+        if kind not in self._grids:
+            return
+        targets = self._targets(kind, entities)
+        if kind in self._pending:
+            self._pending[kind].update(dict.fromkeys(targets))
+        self._kind_of.update(dict.fromkeys(targets, kind))
+        self.version += 1
+
+    def remove(self, kind, entity):
+        if kind not in self._grids:
+            return
+        pending = self._pending.get(kind)
+        for item in self._targets(kind, (entity,)):
+            if pending is not None and item in pending:
+                del pending[item]
+            elif kind not in COLLISION_GRID_KINDS:
+                self._grids[kind].remove(item)
+            self._kind_of.pop(item, None)
+        self.version += 1
+
+    def moved(self, item):
+        """Re-index an item after it was dragged, flipped or otherwise edited."""
+        kind = self._kind_of.get(item)
+        if kind is None:
+            return
+        # Pending items get their area when they are added; the collision world moves platforms itself.
+        if kind not in COLLISION_GRID_KINDS and item not in self._pending[kind]:
+            self._grids[kind].update(item, self._area(kind, item))
+        self.version += 1
+
+    def near(self, kind, rect):
+        """Return the indexed items of `kind` whose clickable areas may overlap `rect`."""
+        return self._grid(kind).query(rect)
+
+    def pick(self, x, y, kinds=PICK_ORDER):
+        """Return the topmost item of the given kinds at (x, y), or None."""
+        for kind in kinds:
+            if kind in UNINDEXED_KINDS:
+                candidates = self.level.entities.collections[kind]
+            else:
+                candidates = self._grid(kind).query_point(x, y)
+            for item in candidates:
+                if self._hit(kind, item, x, y):
+                    return item
+        return None
+
+    def _hit(self, kind, item, x, y):
+        if kind == "slides":
+            return item.contains_point(x, y, threshold=8) or item.flip_icon_contains_point(x, y)
+        if kind == "stars" and item.collected:
+            return False
+        if kind == "platforms" and isinstance(item, Ground):
+            return False  # the ground is in the collision grid, but cannot be edited
+        return item.rect.collidepoint(x, y)
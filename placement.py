@@ -0,0 +1,51 @@
+import math
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+# Region and line fills never place more than this many items at once.
+MAX_FILL_ITEMS = 5000
+
+
+@dataclass(frozen=True)
+class ItemFactory:
+    kind: str                      # registry kind the items are stored under (e.g. "platforms")
+    build: Callable                # build(level, x, y) -> list of new entities placed around (x, y)
+    footprint: Tuple[int, int]     # area one placement covers; fills space items by it
+
+
+# Item type (as used by the inventory and tools, e.g. "platform", "enemy1") -> ItemFactory.
+ITEM_FACTORIES = {}
+
+
+def register_item(item_type, kind, footprint):
+    """Decorator that registers `build(level, x, y)` as the factory for `item_type`."""
+    def register(build):
+        ITEM_FACTORIES[item_type] = ItemFactory(kind, build, footprint)
+        return build
+    return register
+
+
+def region_positions(start, end, footprint, limit=MAX_FILL_ITEMS):
+    """Return the centres of a grid of footprint-sized cells filling the rectangle between two corners."""
+    width, height = footprint
+    left, right = sorted((start[0], end[0]))
+    top, bottom = sorted((start[1], end[1]))
+    columns = max(1, (right - left) // width)
+    rows = max(1, (bottom - top) // height)
+    rows = min(rows, max(1, limit // columns))
+    return [(left + width // 2 + column * width, top + height // 2 + row * height)
+            for row in range(rows) for column in range(min(columns, limit))]
+
+
+def line_positions(start, end, footprint, limit=MAX_FILL_ITEMS):
+    """Return positions from `start` towards `end`, spaced so that neighbouring footprints just touch."""
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return [tuple(start)]
+    ux, uy = dx / length, dy / length
+    width, height = footprint
+    spacing = min(width / abs(ux) if ux else math.inf, height / abs(uy) if uy else math.inf)
+    count = min(int(length // spacing) + 1, limit)
+    return [(round(start[0] + ux * spacing * i), round(start[1] + uy * spacing * i)) for i in range(count)]
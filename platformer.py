@@ -1,11 +1,20 @@
+import os
+import random
 import sys
 import pygame
 import pygame_gui
 from player import Player         # Import the Player class from player.py
 from level import Level           # Import the Level class
+from level_file import build_level, read_level_data, save_level
 from inventory import InventoryPanel
-
-pygame.init()
+from assets import assets
+from sound_bank import sound_bank
+from fonts import render_text
+from renderer import Renderer
+from simulation import handle_event, step
+from profiler import FrameProfiler
+from replay import Recorder, Session
+from timestep import REFERENCE_RATE, FixedTimestep, Interpolator, sim_clock
 
 # -----------------------
 # Constants and Settings
@@ -15,46 +24,99 @@ FPS = 60
 GRAVITY = 0.5
 PLAYER_SPEED = 5
 JUMP_FORCE = 10
+# Run with --dirty-rects to only push changed screen areas to the display.
+DIRTY_RECTS = "--dirty-rects" in sys.argv
+# F3 toggles the frame profiler overlay, F4 exports its buffer to CSV.
+# Run with --profile to start with the overlay shown.
+PROFILE = "--profile" in sys.argv
+PROFILER_TOGGLE_KEY = pygame.K_F3
+PROFILER_EXPORT_KEY = pygame.K_F4
+
+
+def _arg_value(flag):
+    """Return the value following `flag` on the command line, or None."""
+    if flag in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(flag) + 1]
+    return None
+
+
+# Run with --record FILE to save the input of the first Free Play session,
+# and with --replay FILE to play a recorded session back (--no-frame-cap
+# runs it as fast as possible).
+RECORD_PATH = _arg_value("--record")
+REPLAY_PATH = _arg_value("--replay")
+NO_FRAME_CAP = "--no-frame-cap" in sys.argv
+# The game logic runs in fixed steps at this rate, independent of the frame
+# rate; --sim-rate HZ lowers it on slow machines without changing game speed.
+SIM_RATE = int(_arg_value("--sim-rate") or REFERENCE_RATE)
+# Run with --batch-enemies to step autonomous enemies together with NumPy
+# (same results, faster with large crowds).
+BATCH_ENEMIES = "--batch-enemies" in sys.argv
+# F5 saves the level being played to SAVED_LEVEL_PATH (not in Campaign).
+# Level Builder continues that level; Campaign plays every level file in
+# LEVELS_DIR in name order.
+LEVELS_DIR = "levels"
+SAVED_LEVEL_PATH = os.path.join(LEVELS_DIR, "my_level.lvl")
+SAVE_LEVEL_KEY = pygame.K_F5
 
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# -----------------------
-# Display Setup
-# -----------------------
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-SCREEN_WIDTH = screen.get_width()
-SCREEN_HEIGHT = screen.get_height()
-pygame.display.set_caption("Basic Platformer")
-clock = pygame.time.Clock()
-
-# -----------------------
-# pygame_gui Manager Setup
-# -----------------------
-manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
-
-# -----------------------
-# Load Background & Overlay
-# -----------------------
-background = pygame.image.load("images/background.png").convert()
-background = pygame.transform.smoothscale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-overlay.fill((255, 255, 255))
-overlay.set_alpha(80)  # Semi-transparent overlay
+# Display, UI manager and HUD assets; set up by init_display() so that
+# importing this module does not open a window.
+screen = None
+SCREEN_WIDTH = SCREEN_HEIGHT = 0
+clock = None
+renderer = None
+manager = None
+background = None
+overlay = None
+star_icon = None
+trash_icon = None
+trash_sound = None
+
+def init_display():
+    """Open the fullscreen window and load everything the game loops draw with."""
+    global screen, SCREEN_WIDTH, SCREEN_HEIGHT, clock, renderer, manager
+    global background, overlay, star_icon, trash_icon, trash_sound
+
+    pygame.init()
+
+    # -----------------------
+    # Display Setup
+    # -----------------------
+    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    SCREEN_WIDTH = screen.get_width()
+    SCREEN_HEIGHT = screen.get_height()
+    pygame.display.set_caption("Basic Platformer")
+    clock = pygame.time.Clock()
+    renderer = Renderer(screen, dirty_rects=DIRTY_RECTS)
+
+    # -----------------------
+    # pygame_gui Manager Setup
+    # -----------------------
+    manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    # -----------------------
+    # Load Background & Overlay
+    # -----------------------
+    background = pygame.image.load("images/background.png").convert()
+    background = pygame.transform.smoothscale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    overlay.fill((255, 255, 255))
+    overlay.set_alpha(80)  # Semi-transparent overlay
 
-# -----------------------
-# Load Star Icon (for star counter)
-# -----------------------
-star_icon = pygame.image.load("images/star.png").convert_alpha()
-star_icon = pygame.transform.smoothscale(star_icon, (40, 40))
+    # -----------------------
+    # Load Star Icon (for star counter)
+    # -----------------------
+    star_icon = assets.image("images/star.png", (40, 40))
 
-# Load Trash Icon (for trash counter)
-trash_icon = pygame.image.load("images/trash.png").convert_alpha()
-trash_icon = pygame.transform.smoothscale(trash_icon, (35, 35))
+    # Load Trash Icon (for trash counter)
+    trash_icon = assets.image("images/trash.png", (35, 35))
 
-# Load Trash Sound (plays when trash is collected)
-trash_sound = pygame.mixer.Sound("sounds/crumple.wav")
+    # Load Trash Sound (plays when trash is collected)
+    trash_sound = sound_bank.get("crumple")
 
 # -----------------------
 # Custom Confirmation Dialog
@@ -121,6 +183,7 @@ def custom_confirmation_dialog(message, use_title=True, opaque_background=False)
     )
     
     confirmed = None
+    renderer.invalidate()
     while confirmed is None:
         time_delta = clock.tick(FPS) / 1000.0
         for event in pygame.event.get():
@@ -144,8 +207,10 @@ def custom_confirmation_dialog(message, use_title=True, opaque_background=False)
             screen.blit(background, (0, 0))
             screen.blit(overlay, (0, 0))
         manager.draw_ui(screen)
-        pygame.display.flip()
+        renderer.add(dialog_rect)
+        renderer.present()
     dialog_panel.kill()
+    renderer.invalidate()
     return confirmed
 
 # -----------------------
@@ -154,11 +219,7 @@ def get_tinted_surface(surface, tint_color=(255, 255, 255, 80)):
     """
     Return a tinted copy of the given surface, highlighting only its non-transparent parts.
     """
-    tinted = surface.copy()
-    overlay = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
-    overlay.fill(tint_color)
-    tinted.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-    return tinted
+    return assets.tinted(surface, tint_color)
 
 # -----------------------
 # Mode Selection UI using pygame_gui
@@ -203,6 +264,7 @@ def mode_selection_loop():
     campaign_tinted = get_tinted_surface(campaign_img, (255, 255, 255, 80))
 
     selected_mode = None
+    renderer.invalidate()
     while selected_mode is None:
         time_delta = clock.tick(FPS) / 1000.0
         for event in pygame.event.get():
@@ -252,7 +314,10 @@ def mode_selection_loop():
         else:
             screen.blit(campaign_img, campaign_rect)
 
-        pygame.display.flip()
+        # Only the buttons change between frames (hover highlight).
+        renderer.add_all([free_play_rect, level_builder_rect, campaign_rect])
+        renderer.present()
+    renderer.invalidate()
     return selected_mode
 
 def show_message(message, duration=2000):
@@ -268,6 +333,7 @@ def show_message(message, duration=2000):
         manager=manager
     )
     start_time = pygame.time.get_ticks()
+    renderer.invalidate()
     while pygame.time.get_ticks() - start_time < duration:
         time_delta = clock.tick(FPS) / 1000.0
         for event in pygame.event.get():
@@ -282,18 +348,22 @@ def show_message(message, duration=2000):
         screen.blit(background, (0, 0))
         screen.blit(overlay, (0, 0))
         manager.draw_ui(screen)
-        pygame.display.flip()
+        renderer.add(panel.rect)
+        renderer.present()
     panel.kill()
+    renderer.invalidate()
 
 def display_overlay_message(message, duration=3000):
     overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
     overlay.set_alpha(180)  # Adjust transparency as needed
     overlay.fill((50, 50, 50))  # Slightly transparent grey
     screen.blit(overlay, (0, 0))
-    text = pygame.font.SysFont(None, 64).render(message, True, (245, 245, 245))  # Soft white text
+    text = render_text(message, 64, (245, 245, 245))  # Soft white text
     text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
     screen.blit(text, text_rect)
-    pygame.display.flip()
+    renderer.invalidate()
+    renderer.present()
+    renderer.invalidate()
     start_time = pygame.time.get_ticks()
     while pygame.time.get_ticks() - start_time < duration:
         for event in pygame.event.get():
@@ -301,24 +371,121 @@ def display_overlay_message(message, duration=3000):
                 return
         pygame.time.delay(10)
 
+def campaign_levels():
+    """Return the level files Campaign mode plays, in name order."""
+    if not os.path.isdir(LEVELS_DIR):
+        return []
+    return [os.path.join(LEVELS_DIR, name) for name in sorted(os.listdir(LEVELS_DIR))
+            if name.endswith((".lvl", ".json"))]
+
+def choose_mode():
+    """Show the main menu until a mode that can be started is picked."""
+    while True:
+        selected_mode = mode_selection_loop()
+        if selected_mode == "Campaign" and not campaign_levels():
+            show_message("No levels yet! Save one with F5.", duration=2000)
+        elif selected_mode != "Free Play" and (RECORD_PATH or REPLAY_PATH):
+            # Sessions start from the default level, so only Free Play is recorded.
+            show_message("Recordings only cover Free Play.", duration=2000)
+        else:
+            return selected_mode
+
+def open_level(path):
+    """Load a saved level for this screen, or return None (after saying so) if the file is unreadable."""
+    try:
+        data = read_level_data(path)
+    except (OSError, ValueError) as error:
+        print(f"Cannot open level: {error}")
+        show_message(f"Cannot open {os.path.basename(path)}", duration=2000)
+        return None
+    if data.world_size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        print(f"Warning: {path} was saved at {data.world_size}, screen is {(SCREEN_WIDTH, SCREEN_HEIGHT)}")
+    return build_level(data, (SCREEN_WIDTH, SCREEN_HEIGHT), batch_enemies=BATCH_ENEMIES)
+
+def start_mode(selected_mode=None, campaign_index=0):
+    """
+    Return (mode, campaign index, level) to play next: `selected_mode` (for
+    Campaign, from its `campaign_index`th level on), or the mode picked in
+    the main menu. Campaign skips level files that cannot be opened; when a
+    mode has no level left to open, the menu is shown again.
+    """
+    while True:
+        if selected_mode is None:
+            selected_mode, campaign_index = choose_mode(), 0
+        if selected_mode == "Campaign":
+            paths = campaign_levels()
+            while campaign_index < len(paths):
+                level = open_level(paths[campaign_index])
+                if level is not None:
+                    return selected_mode, campaign_index, level
+                campaign_index += 1
+        elif selected_mode == "Level Builder" and os.path.exists(SAVED_LEVEL_PATH):
+            level = open_level(SAVED_LEVEL_PATH)
+            if level is not None:
+                return selected_mode, 0, level
+        else:
+            return selected_mode, 0, Level(batch_enemies=BATCH_ENEMIES)
+        selected_mode = None
+
 # -----------------------
 # Main Game Loop
 # -----------------------
 def main():
-    selected_mode = mode_selection_loop()
-    while selected_mode != "Free Play":
-        show_message("Coming soon!", duration=2000)
-        selected_mode = mode_selection_loop()
+    init_display()
+    sim_clock.set_rate(SIM_RATE)
+    recorder = Recorder((SCREEN_WIDTH, SCREEN_HEIGHT)) if RECORD_PATH else None
+    replay_frames = None
+    if REPLAY_PATH:
+        selected_mode, campaign_index = choose_mode(), 0
+        session = Session.load(REPLAY_PATH)
+        if session.world_size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            print(f"Warning: session was recorded at {session.world_size}, screen is {(SCREEN_WIDTH, SCREEN_HEIGHT)}")
+        sim_clock.set_rate(session.sim_rate)
+        random.seed(session.seed)
+        replay_frames = session.input_frames()
+        player = Player(x=100, y=300, width=40, height=40, world_size=session.world_size)
+        level = Level(world_size=session.world_size, batch_enemies=BATCH_ENEMIES)
+        inventory = InventoryPanel(*session.world_size)
+    else:
+        if recorder:
+            recorder.seed_rng()
+        player = Player(x=100, y=300, width=40, height=40)
+        selected_mode, campaign_index, level = start_mode()
+        inventory = InventoryPanel(SCREEN_WIDTH, SCREEN_HEIGHT)
+    level.set_backdrop(background, overlay)
+    profiler = FrameProfiler()
+    if PROFILE:
+        profiler.toggle()
+
+    def stop_recording():
+        """Save the recording; only the first level of the run is recorded."""
+        nonlocal recorder
+        if recorder:
+            recorder.save(RECORD_PATH)
+            print(f"Recorded {len(recorder.session)} steps to {RECORD_PATH}")
+            recorder = None
+
+    def restart(new):
+        """Start playing `new` with a fresh player and inventory."""
+        nonlocal player, level, inventory, pending_events
+        player = Player(x=100, y=300, width=40, height=40)
+        level = new
+        level.set_backdrop(background, overlay)
+        inventory = InventoryPanel(SCREEN_WIDTH, SCREEN_HEIGHT)
+        pending_events = []
+        interpolator.clear()
     
-    # Free Play mode begins.
-    player = Player(x=100, y=300, width=40, height=40)
-    player.trash_collected = 0  # Initialize trash counter
-    level = Level()
-    inventory = InventoryPanel(SCREEN_WIDTH, SCREEN_HEIGHT)
+    timestep = FixedTimestep(sim_clock)
+    interpolator = Interpolator()
+    # Live game input waits here until the next simulation step consumes it.
+    pending_events = []
     
     running = True
     while running:
-        time_delta = clock.tick(FPS) / 1000.0
+        profiler.begin_frame()
+        # The frame cap only limits drawing; the simulation runs at sim_clock.rate.
+        time_delta = clock.tick(0 if NO_FRAME_CAP else FPS) / 1000.0
+        profiler.mark("wait")
         events = pygame.event.get()
         
         # Handle events first
@@ -326,70 +493,102 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                if custom_confirmation_dialog("Return to main menu?", use_title=False, opaque_background=False):
-                    selected_mode = mode_selection_loop()
-                    while selected_mode != "Free Play":
-                        show_message("Coming soon!", duration=2000)
-                        selected_mode = mode_selection_loop()
-                    player = Player(x=100, y=300, width=40, height=40)
-                    player.trash_collected = 0  # Reset trash counter
-                    level = Level()
-                    inventory = InventoryPanel(SCREEN_WIDTH, SCREEN_HEIGHT)
+                if replay_frames is not None:
+                    running = False  # ESC stops a replay
+                elif custom_confirmation_dialog("Return to main menu?", use_title=False, opaque_background=False):
+                    stop_recording()
+                    selected_mode, campaign_index, new = start_mode()
+                    restart(new)
                     continue
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_i:
-                inventory.toggle(SCREEN_WIDTH)
-            inventory.handle_event(event, level, player)
-            
-            # Wenn auf den Spieler geklickt wird, alle gegnerischen Steuerungen zurücksetzen.
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if player.rect.collidepoint(event.pos):
-                    for enemy in level.enemies:
-                        enemy.controlled = False
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_TOGGLE_KEY:
+                profiler.toggle()
+                renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_EXPORT_KEY:
+                path = profiler.export_csv()
+                if path is None:
+                    print("No frames profiled yet: press F3 to show the profiler overlay and record")
+                else:
+                    # Only frames from while the overlay was shown are in the buffer.
+                    note = "" if profiler.enabled else " (recorded while the overlay was last shown)"
+                    print(f"Profile written to {path}{note}")
+            elif event.type == pygame.KEYDOWN and event.key == SAVE_LEVEL_KEY and selected_mode != "Campaign":
+                os.makedirs(LEVELS_DIR, exist_ok=True)
+                save_level(level, SAVED_LEVEL_PATH)
+                print(f"Level saved to {SAVED_LEVEL_PATH}")
+                if not level.trashes:
+                    print("Warning: the saved level has no trash left, so it cannot be won")
+            # During a replay the game input comes from the session instead.
+            if replay_frames is None:
+                pending_events.append(event)
         
-        # Add this line to update inventory panel position
-        inventory.update()
-        
-        level.handle_mouse_events(events)
-        # Alte Zeile:
-        # player.handle_input()
-
-        # Neue Logik: Falls ein Monster gesteuert wird, dieses bewegen,
-        # sonst den Spieler steuern.
-        controlled_enemy = None
-        for enemy in level.enemies:
-            if getattr(enemy, "controlled", False):
-                controlled_enemy = enemy
-                break
+        profiler.mark("events")
 
-        if controlled_enemy:
-            controlled_enemy.handle_input()
+        # Run as many fixed simulation steps as the elapsed time calls for
+        # (exactly one per frame when replaying uncapped, i.e. at full speed).
+        if replay_frames is not None and NO_FRAME_CAP:
+            steps = 1
         else:
-            player.handle_input()
-        
-        elevator_movements = level.update(player)
-        
-        # Check for trash collection
-        for trash in level.trashes[:]:
-            if player.rect.colliderect(trash.rect):
-                level.trashes.remove(trash)
-                player.trash_collected += 1
+            steps = timestep.advance(time_delta)
+        replay_finished = False
+        for i in range(steps):
+            if i == steps - 1:
+                # Drawing blends from here to where this last step puts things.
+                interpolator.capture([player.rect] + level.moving_rects())
+            if replay_frames is not None:
+                frame = next(replay_frames, None)
+                if frame is None:
+                    replay_finished = True
+                    break
+                step_events, keys, mouse_pos, now = frame.events, frame.keys, frame.mouse_pos, frame.ticks
+            else:
+                step_events, pending_events = pending_events, []
+                keys = pygame.key.get_pressed()
+                mouse_pos = pygame.mouse.get_pos()
+                now = pygame.time.get_ticks()
+                if recorder:
+                    recorder.record(step_events, keys, mouse_pos, now)
+            for event in step_events:
+                handle_event(event, level, player, inventory, mouse_pos)
+            profiler.mark("events")
+
+            # Add this line to update inventory panel position
+            inventory.update(mouse_pos)
+            profiler.mark("inventory_update")
+
+            # Game logic for this step (mouse editing, input, level and player updates).
+            if step(level, player, step_events, keys, profiler, mouse_pos, now):
                 trash_sound.play()
-        
-        player.update(level.platforms, level.slides, level.trampolines, level, elevator_movements)
-        
-        screen.blit(background, (0, 0))
-        screen.blit(overlay, (0, 0))
-        player.draw(screen)
+            # Game over and winning are handled once the frame is drawn.
+            if player.lives <= 0 or level.all_trash_collected():
+                break
+        if replay_finished:
+            display_overlay_message("Replay finished", duration=2000)
+            break
+
+        # Background, overlay and static geometry come from the level's cached static layer.
+        # The player and hearts are drawn over it, i.e. on top of platforms, slides and
+        # trampolines (they used to be drawn before the level and ended up underneath).
+        if level.static_dirty:
+            renderer.invalidate()
+        level.draw_static(screen)
+        # Moving things are drawn between their last two simulated positions.
+        with interpolator.apply(timestep.alpha):
+            player.draw(screen)
+            level.draw(screen)
+            # Collecting the changed areas is only worth it when they are presented on their own.
+            if renderer.dirty_rects:
+                renderer.add(player.rect)
+                renderer.add_all(level.dynamic_rects())
         player.draw_hearts(screen)
-        level.draw(screen)
+        profiler.mark("draw_world")
         inventory.draw(screen)
         # Draw combined counters for stars and trash in the top right
         margin = 20
         gap_inside = 10
         block_gap = 20
 
-        star_text = pygame.font.SysFont(None, 32).render(f"× {player.stars_collected}", True, BLACK)
-        trash_text = pygame.font.SysFont(None, 32).render(f"× {player.trash_collected}", True, BLACK)
+        star_text = render_text(f"× {player.stars_collected}", 32, BLACK)
+        trash_text = render_text(f"× {player.trash_collected}", 32, BLACK)
 
         star_block_width = 40 + gap_inside + star_text.get_width()
         trash_block_width = 35 + gap_inside + trash_text.get_width()  # trash icon is 35 wide
@@ -407,31 +606,44 @@ def main():
         trash_block_x = start_x + star_block_width + block_gap
         screen.blit(trash_icon, (trash_block_x, y + (40 - 35) // 2))  # center vertically since trash icon is smaller
         screen.blit(trash_text, (trash_block_x + 35 + gap_inside, y + 10))
-        
-        pygame.display.flip()
+
+        if renderer.dirty_rects:
+            renderer.add((10, 10, 50 * max(player.lives, 0), 40))  # hearts
+            renderer.add_all(inventory.dirty_rects())
+            renderer.add((start_x, y, total_counters_width, 40))  # counters
+        renderer.add(profiler.draw(screen))
+        profiler.mark("draw_ui")
+        renderer.present()
+        profiler.mark("present")
+        profiler.end_frame()
         
         # Check for Game Over: if player's lives are finished, display message and reset game.
         if player.lives <= 0:
             display_overlay_message("Game Over", duration=3000)
-            selected_mode = mode_selection_loop()
-            player = Player(x=100, y=300, width=40, height=40)
-            player.trash_collected = 0  # Reset trash counter
-            level = Level()
-            inventory = InventoryPanel(SCREEN_WIDTH, SCREEN_HEIGHT)
+            stop_recording()
+            if replay_frames is not None:
+                break
+            selected_mode, campaign_index, new = start_mode()
+            restart(new)
             continue
         
         # Check for Level Win: if all trash has been collected, display win message and reset game.
-        if len(level.trashes) == 0:
+        if level.all_trash_collected():
             display_overlay_message("You Win!", duration=3000)
-            selected_mode = mode_selection_loop()
-            player = Player(x=100, y=300, width=40, height=40)
-            player.trash_collected = 0
-            level = Level()
-            inventory = InventoryPanel(SCREEN_WIDTH, SCREEN_HEIGHT)
+            stop_recording()
+            if replay_frames is not None:
+                break
+            # Campaign goes on with its next level; everything else returns to the menu.
+            if selected_mode == "Campaign":
+                selected_mode, campaign_index, new = start_mode("Campaign", campaign_index + 1)
+            else:
+                selected_mode, campaign_index, new = start_mode()
+            restart(new)
             continue
         
         manager.update(time_delta)
         
+    stop_recording()
     pygame.quit()
     sys.exit()
 
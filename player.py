@@ -1,6 +1,9 @@
 import pygame
 from physics_object import PhysicsObject
 from slide import SlidePlatform, SlidePhysics
+from assets import assets
+from sound_bank import sound_bank
+from timestep import sim_clock
 
 # Constants for the player:
 GRAVITY = 0.5
@@ -8,23 +11,25 @@ PLAYER_SPEED = 5
 JUMP_FORCE = 10
 
 class Player(PhysicsObject):
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, world_size=None):
         super().__init__()
+        # Size of the world used for the off-screen check and respawning (defaults to the screen).
+        if world_size is None:
+            world_size = pygame.display.get_surface().get_size()
+        self.world_size = world_size
         # Increase player size: scale factor increased from 2 to 2.5
         player_scale = 2.5  # Now the player is a tad larger
         self.rect = pygame.Rect(x, y, int(width * player_scale), int(height * player_scale))
         self.jumps_left = 2
         self.on_slide = False
 
-        self.image = pygame.image.load("images/player_big.png").convert_alpha()
-        self.image = pygame.transform.smoothscale(self.image, (int(width * player_scale), int(height * player_scale)))
+        player_size = (int(width * player_scale), int(height * player_scale))
+        self.image = assets.image("images/player_big.png", player_size)
         self.image_right = self.image
-        self.image_left = pygame.transform.flip(self.image, True, False)
+        self.image_left = assets.image("images/player_big.png", player_size, flip=True)
         self.facing_right = True
 
-        self.ouch_sound = pygame.mixer.Sound("sounds/big_player_ouch.wav")
-        self.boing_sound = pygame.mixer.Sound("sounds/big_player_boing.wav")
-        self.portal_sound = pygame.mixer.Sound("sounds/big_player_portal.wav")
+        self.set_voice("big")
 
         self.width = int(width * player_scale)
         self.height = int(height * player_scale)
@@ -32,28 +37,24 @@ class Player(PhysicsObject):
         self.invulnerable_timer = 0
         self.game_over = False
 
-        self.heart_image = pygame.image.load("images/heart.png").convert_alpha()
-        self.heart_image = pygame.transform.smoothscale(self.heart_image, (40, 40))
+        self.heart_image = assets.image("images/heart.png", (40, 40))
 
         self.on_elevator = False
         self.stars_collected = 0
-        self.star_sound = pygame.mixer.Sound("sounds/collect_star.wav")
+        self.trash_collected = 0
+        self.star_sound = sound_bank.get("collect_star")
         
         # Gun related attributes (always equipped)
-        self.gun_image = pygame.image.load("images/gun_lowres.png").convert_alpha()
         gun_scale = 0.20  # Scale down the gun to 20% of its original size
-        gun_new_size = (int(self.gun_image.get_width() * gun_scale),
-                        int(self.gun_image.get_height() * gun_scale))
-        self.gun_image = pygame.transform.smoothscale(self.gun_image, gun_new_size)
+        gun_new_size = assets.scaled_size("images/gun_lowres.png", gun_scale)
+        self.gun_image = assets.image("images/gun_lowres.png", gun_new_size)
         self.gun_image_right = self.gun_image
-        self.gun_image_left = pygame.transform.flip(self.gun_image, True, False)
+        self.gun_image_left = assets.image("images/gun_lowres.png", gun_new_size, flip=True)
         self.shoot_cooldown = 0
 
-        # NEW: Load the gun shooting sound. Default to "gun.wav"
-        self.gun_shoot_sound = pygame.mixer.Sound("sounds/gun.wav")
-
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
+    def handle_input(self, keys=None):
+        if keys is None:
+            keys = pygame.key.get_pressed()
         if not self.on_slide:
             if keys[pygame.K_LEFT]:
                 self.x_velocity = -PLAYER_SPEED
@@ -70,11 +71,9 @@ class Player(PhysicsObject):
                 self.y_velocity = -JUMP_FORCE
                 self.jumps_left -= 1
 
-    def update(self, platforms, slides, trampolines, level, elevator_movements=None):
-        # Combine platforms and elevator platforms.
-        all_platforms = platforms.copy()
-        for elevator in level.elevators:
-            all_platforms.append(elevator.platform_rect)
+    def update(self, slides, trampolines, level, elevator_movements=None, keys=None):
+        # Platforms and elevator platforms near the area we can move through this frame.
+        all_platforms = level.collision_world.colliders_near(self.swept_rect())
         
         # Update physics (gravity, collisions, portal checks, and trampolines).
         # Because Player overrides check_trampolines, that method will be used.
@@ -85,17 +84,15 @@ class Player(PhysicsObject):
             self.jumps_left = 2
 
         # Handle elevator movement (as before).
-        elevator_collisions = []
-        for elevator in level.elevators:
-            if self.rect.colliderect(elevator.platform_rect):
-                elevator_collisions.append(elevator)
+        elevator_collisions = level.collision_world.elevators_touching(self.rect)
         for elevator in elevator_collisions:
             if self.rect.bottom == elevator.platform_rect.top:
                 movement = elevator_movements.get(elevator, (0, 0))
                 if not hasattr(self, 'elevator_offset'):
                     self.elevator_offset = (self.rect.x - elevator.platform_rect.x,
                                             self.rect.y - elevator.platform_rect.y)
-                self.elevator_offset = (self.elevator_offset[0] + self.x_velocity, self.elevator_offset[1])
+                self.elevator_offset = (self.elevator_offset[0] + self.x_velocity * sim_clock.tick_scale,
+                                        self.elevator_offset[1])
                 self.rect.x += movement[0]
                 self.rect.y += movement[1]
                 self.rect.x = elevator.platform_rect.x + self.elevator_offset[0]
@@ -105,17 +102,17 @@ class Player(PhysicsObject):
 
         # Handle slide behavior.
         self.check_slides(slides)
-        self.ensure_not_below_any_platform(platforms)
+        self.ensure_not_below_any_platform(level.collision_world.static_near(self.rect))
         self.check_off_screen()
         if self.invulnerable_timer <= 0:
             self.check_enemy_collisions(level.enemies)
         else:
-            self.invulnerable_timer -= 1
+            self.invulnerable_timer -= sim_clock.tick_scale
 
         # --- NEW: Gun shooting logic ---
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         if keys[pygame.K_f] and self.shoot_cooldown <= 0:
-            from bullet import Bullet  # Import here to avoid circular dependencies
             if self.facing_right:
                 bullet_x = self.rect.right
                 direction = "right"
@@ -123,12 +120,12 @@ class Player(PhysicsObject):
                 bullet_x = self.rect.left
                 direction = "left"
             bullet_y = self.rect.centery
-            level.bullets.append(Bullet(bullet_x, bullet_y, direction))
-            # Play the gun shooting sound
-            self.gun_shoot_sound.play()
+            # Bullets come from the level's pool; no sound if none is free
+            if level.fire_bullet(bullet_x, bullet_y, direction):
+                self.gun_shoot_sound.play()
             self.shoot_cooldown = 20  # Cooldown frames between shots
         if self.shoot_cooldown > 0:
-            self.shoot_cooldown -= 1
+            self.shoot_cooldown -= sim_clock.tick_scale
         # --- End Gun logic ---
 
     def check_slides(self, slides):
@@ -164,8 +161,8 @@ class Player(PhysicsObject):
                     self.on_ground = True
 
     def check_off_screen(self):
-        screen_obj = pygame.display.get_surface()
-        if self.rect.top > screen_obj.get_height() or self.rect.right < 0 or self.rect.left > screen_obj.get_width():
+        world_width, world_height = self.world_size
+        if self.rect.top > world_height or self.rect.right < 0 or self.rect.left > world_width:
             self.lose_life()
 
     def check_enemy_collisions(self, enemies):
@@ -189,8 +186,8 @@ class Player(PhysicsObject):
             self.lives -= 1
             self.invulnerable_timer = 60
             self.ouch_sound.play()
-            screen_obj = pygame.display.get_surface()
-            self.rect.center = (screen_obj.get_width() // 2, screen_obj.get_height() // 2)
+            world_width, world_height = self.world_size
+            self.rect.center = (world_width // 2, world_height // 2)
             if self.lives <= 0:
                 self.game_over = True
 
@@ -222,26 +219,25 @@ class Player(PhysicsObject):
         for i in range(self.lives):
             surface.blit(self.heart_image, (10 + i * 50, 10))
 
-    def change_character(self, new_sprite_path, sound_data):
+    def set_voice(self, voice_set):
+        """Switch to one of the named voice sets from the sound bank."""
+        voice = sound_bank.voice(voice_set)
+        self.ouch_sound = voice["ouch"]
+        self.boing_sound = voice["boing"]
+        self.portal_sound = voice["portal"]
+        self.gun_shoot_sound = voice["shoot"]
+
+    def change_character(self, new_sprite_path, voice_set):
         """Update the player's appearance and sound effects"""
         # Load and scale new character assets
-        original_image = pygame.image.load(new_sprite_path).convert_alpha()
-        self.image = pygame.transform.smoothscale(original_image, (self.rect.width, self.rect.height))
+        self.image = assets.image(new_sprite_path, self.rect.size)
         
         # Update directional images
         self.image_right = self.image
-        self.image_left = pygame.transform.flip(self.image, True, False)
+        self.image_left = assets.image(new_sprite_path, self.rect.size, flip=True)
         
-        # Update all sounds
-        self.ouch_sound = pygame.mixer.Sound(sound_data["ouch_sound"])
-        self.boing_sound = pygame.mixer.Sound(sound_data["boing_sound"])
-        self.portal_sound = pygame.mixer.Sound(sound_data["portal_sound"])
-        
-        # NEW: Update gun shooting sound based on character type
-        if "player_small" in new_sprite_path:
-            self.gun_shoot_sound = pygame.mixer.Sound("sounds/small_player_shoot.wav")
-        else:
-            self.gun_shoot_sound = pygame.mixer.Sound("sounds/gun.wav")
+        # Update all sounds (including the gun sound) from the pre-decoded voice set
+        self.set_voice(voice_set)
         
         # Preserve position with original size
         old_center = self.rect.center
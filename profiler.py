@@ -0,0 +1,175 @@
+import csv
+import time
+import numpy as np
+import pygame
+from fonts import get_font
+
+# Stages of platformer.main, in the order they run each frame.
+MAIN_LOOP_STAGES = [
+    "wait",              # clock.tick (frame limiter)
+    "events",            # event loop, incl. inventory.handle_event
+    "inventory_update",
+    "mouse_events",      # level.handle_mouse_events
+    "input",             # player / controlled enemy handle_input
+    "level_update",      # level.update + collect_trash
+    "player_update",
+    "draw_world",        # static layer, player, hearts, level.draw
+    "draw_ui",           # inventory, counters, profiler overlay
+    "present",           # renderer.present (display flip/update)
+]
+
+DEFAULT_CAPACITY = 300  # frames kept in the ring buffer (5 s at 60 FPS)
+OVERLAY_REFRESH = 15    # rebuild the overlay every N recorded frames
+GRAPH_HEIGHT = 120
+GRAPH_BUDGET_MS = 1000 / 60  # drawn as a line; bars above it missed 60 FPS
+OVERLAY_FONT = "dejavusansmono,couriernew,monospace"  # monospace so the table columns line up
+
+STAGE_COLORS = [
+    (120, 120, 120), (230, 25, 75), (60, 180, 75), (255, 225, 25), (0, 130, 200),
+    (245, 130, 48), (145, 30, 180), (70, 240, 240), (240, 50, 230), (210, 245, 60),
+]
+
+
+class FrameProfiler:
+    """
+    Records how long each stage of a frame takes, in a fixed-size ring buffer.
+
+    Call begin_frame() once per frame, mark(stage) right after each stage
+    finishes (the time since the previous mark is charged to that stage) and
+    end_frame() once the frame is done. While disabled, every call returns
+    straight away and nothing is recorded.
+    """
+
+    def __init__(self, stages=MAIN_LOOP_STAGES, capacity=DEFAULT_CAPACITY, enabled=False):
+        self.stages = list(stages)
+        self.stage_index = {name: i for i, name in enumerate(self.stages)}
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(self.stages)))  # milliseconds
+        self.frame_numbers = np.zeros(capacity, dtype=np.int64)
+        self.frames_recorded = 0
+        self.enabled = enabled
+        self.overlay_visible = False
+        self._current = np.zeros(len(self.stages))
+        self._last = 0
+        self._overlay = None
+        self._overlay_frame = -1
+
+    def toggle(self):
+        """Show or hide the overlay; recording runs while the overlay is shown."""
+        self.overlay_visible = not self.overlay_visible
+        self.enabled = self.overlay_visible
+        self._overlay = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current[:] = 0
+        self._last = time.perf_counter()
+
+    def mark(self, stage):
+        """Charge the time since the previous mark (or begin_frame) to `stage`."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[self.stage_index[stage]] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        slot = self.frames_recorded % self.capacity
+        self.samples[slot] = self._current
+        self.frame_numbers[slot] = self.frames_recorded
+        self.frames_recorded += 1
+
+    def recorded(self):
+        """Return (frame_numbers, samples) of the buffered frames, oldest first."""
+        n = min(self.frames_recorded, self.capacity)
+        if self.frames_recorded <= self.capacity:
+            return self.frame_numbers[:n], self.samples[:n]
+        start = self.frames_recorded % self.capacity
+        order = np.r_[start:self.capacity, 0:start]
+        return self.frame_numbers[order], self.samples[order]
+
+    def stats(self):
+        """Return {stage: (mean, p95, max)} in milliseconds, including a "total" row."""
+        _, samples = self.recorded()
+        if len(samples) == 0:
+            return {}
+        columns = list(self.stages) + ["total"]
+        data = np.column_stack([samples, samples.sum(axis=1)])
+        mean = data.mean(axis=0)
+        p95 = np.percentile(data, 95, axis=0)
+        peak = data.max(axis=0)
+        return {name: (mean[i], p95[i], peak[i]) for i, name in enumerate(columns)}
+
+    def export_csv(self, path=None):
+        """
+        Write the buffered frames to a CSV file (one row per frame) and return
+        its path, or return None without writing anything if no frame was
+        recorded yet (recording only runs while the overlay is shown).
+        """
+        frame_numbers, samples = self.recorded()
+        if len(samples) == 0:
+            return None
+        if path is None:
+            path = time.strftime("profile_%Y%m%d_%H%M%S.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + self.stages + ["total"])
+            for frame, row in zip(frame_numbers, samples):
+                writer.writerow([int(frame)] + [f"{v:.4f}" for v in row] + [f"{row.sum():.4f}"])
+        return path
+
+    # ------------------------------------------------------------------
+    # Overlay
+    # ------------------------------------------------------------------
+    def draw(self, surface, pos=(10, 60)):
+        """Draw the graph and stats table; returns the drawn rect (or None when hidden)."""
+        if not self.overlay_visible:
+            return None
+        if self._overlay is None or self.frames_recorded - self._overlay_frame >= OVERLAY_REFRESH:
+            self._overlay = self._render_overlay()
+            self._overlay_frame = self.frames_recorded
+        return surface.blit(self._overlay, pos)
+
+    def _render_overlay(self):
+        font = get_font(18, OVERLAY_FONT)
+        line_height = font.get_linesize()
+        table_height = line_height * (len(self.stages) + 2)
+        width = max(self.capacity, 330)
+        overlay = pygame.Surface((width + 20, GRAPH_HEIGHT + table_height + 30), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+
+        # Stacked bar per frame, newest on the right. The graph is scaled so
+        # that twice the 60 FPS budget fills its height.
+        _, samples = self.recorded()
+        scale = GRAPH_HEIGHT / (2 * GRAPH_BUDGET_MS)
+        graph_bottom = 10 + GRAPH_HEIGHT
+        x0 = 10 + width - len(samples)
+        for x, row in enumerate(samples):
+            y = graph_bottom
+            for i, ms in enumerate(row):
+                h = int(ms * scale)
+                if h <= 0:
+                    continue
+                y -= h
+                if y < 10:
+                    h -= 10 - y
+                    y = 10
+                overlay.fill(STAGE_COLORS[i % len(STAGE_COLORS)], (x0 + x, y, 1, h))
+                if y == 10:
+                    break
+        budget_y = graph_bottom - int(GRAPH_BUDGET_MS * scale)
+        pygame.draw.line(overlay, (255, 255, 255), (10, budget_y), (10 + width, budget_y))
+
+        # Stats table: mean / p95 / max per stage.
+        y = graph_bottom + 10
+        overlay.blit(font.render(f"{'stage':<17}{'mean':>7}{'p95':>7}{'max':>7}  ms", True, (255, 255, 255)), (10, y))
+        for i, (name, (mean, p95, peak)) in enumerate(self.stats().items()):
+            y += line_height
+            color = STAGE_COLORS[i % len(STAGE_COLORS)] if i < len(self.stages) else (255, 255, 255)
+            pygame.draw.rect(overlay, color, (10, y + 3, 8, 8))
+            text = f"{name:<17}{mean:7.2f}{p95:7.2f}{peak:7.2f}"
+            overlay.blit(font.render(text, True, (255, 255, 255)), (22, y))
+        return overlay
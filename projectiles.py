@@ -0,0 +1,78 @@
+from collision import sweep_rect
+from spatial import SpatialHash
+
+# Enemies move every frame, so their grid is rebuilt when there are bullets to test.
+ENEMY_CELL_SIZE = 128
+
+
+class ProjectileSystem:
+    """
+    Moves the level's bullets and resolves their hits against the world.
+
+    Each bullet's path for the frame is swept against the platforms and
+    enemies near it (using the level's platform index and a per-frame enemy
+    grid), and the earliest hit along the path wins. Sweeping instead of
+    testing only the end position means fast bullets cannot pass through
+    thin geometry. Kills and despawns are collected and applied once per
+    frame instead of removing items from the lists while iterating.
+    """
+
+    def __init__(self, level):
+        self.level = level
+        self.enemy_index = SpatialHash(ENEMY_CELL_SIZE)
+
+    def _build_enemy_index(self):
+        self.enemy_index.clear()
+        for enemy in self.level.enemies:
+            self.enemy_index.insert(enemy, enemy.rect)
+
+    def _first_hit(self, start_rect, dx, dy, path, killed):
+        """Return (time, target, is_enemy) of the earliest hit along the path, or None."""
+        best = None
+        for platform in self.level.collision_world.static_near(path):
+            t = sweep_rect(start_rect, dx, dy, platform.rect)
+            if t is not None and (best is None or t < best[0]):
+                best = (t, platform, False)
+        for enemy in self.enemy_index.query(path):
+            if enemy in killed:
+                continue
+            t = sweep_rect(start_rect, dx, dy, enemy.rect)
+            # On a tie the platform was hit first (as the old per-frame check did).
+            if t is not None and (best is None or t < best[0]):
+                best = (t, enemy, True)
+        return best
+
+    def update(self, screen_width, screen_height):
+        level = self.level
+        if not level.bullets:
+            return
+        self._build_enemy_index()
+        killed = set()
+        despawned = set()
+        for bullet in level.bullets:
+            start_rect = bullet.rect.copy()
+            bullet.update()
+            # Remove bullet if off screen
+            if bullet.is_off_screen(screen_width, screen_height):
+                despawned.add(bullet)
+                continue
+            dx = bullet.rect.x - start_rect.x
+            dy = bullet.rect.y - start_rect.y
+            path = start_rect.union(bullet.rect)
+            hit = self._first_hit(start_rect, dx, dy, path, killed)
+            if hit is None:
+                continue
+            despawned.add(bullet)
+            _, target, is_enemy = hit
+            if is_enemy:
+                killed.add(target)
+                # Create a massive explosion using 100 particles
+                level.confetti.emit(target.rect.center, num_particles=100)
+
+        if despawned:
+            level.bullets = [b for b in level.bullets if b not in despawned]
+            for bullet in despawned:
+                level.bullet_pool.release(bullet)
+        if killed:
+            for enemy in killed:
+                level.remove_item(enemy)
@@ -0,0 +1,100 @@
+class EntityList:
+    """
+    The entities of one kind, in the order they were added.
+
+    Iterates like a list, but membership tests and removal are O(1) because
+    it is backed by an insertion-ordered dict. It cannot be indexed: take
+    list(entities) for a copy (e.g. to remove entities while looping). Only
+    the EntityRegistry that owns it adds and removes entities.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self):
+        self._items = {}
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __repr__(self):
+        return f"EntityList({list(self._items)!r})"
+
+
+class EntityRegistry:
+    """
+    Gives every entity of a level an id and keeps an EntityList per kind.
+
+    An entity can be registered with parts that stand for it (the end points
+    of an elevator): looking up or removing a part finds its entity.
+    """
+
+    def __init__(self, kinds):
+        self.collections = {kind: EntityList() for kind in kinds}
+        self._by_id = {}
+        self._kind_of = {}
+        self._parts = {}
+        self._owner_of = {}
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, kind, entity, parts=()):
+        """Register `entity` under `kind`, give it an `entity_id` and return it."""
+        entity.entity_id = self._next_id
+        self._next_id += 1
+        self._by_id[entity.entity_id] = entity
+        self._kind_of[entity] = kind
+        self.collections[kind]._items[entity] = None
+        if parts:
+            self._parts[entity] = tuple(parts)
+            for part in parts:
+                self._owner_of[part] = entity
+        return entity
+
+    def add_many(self, kind, entities):
+        """Register entities without parts under `kind` (same as add() for each, in order)."""
+        by_id = self._by_id
+        kind_of = self._kind_of
+        items = self.collections[kind]._items
+        next_id = self._next_id
+        for entity in entities:
+            entity.entity_id = next_id
+            by_id[next_id] = entity
+            kind_of[entity] = kind
+            items[entity] = None
+            next_id += 1
+        self._next_id = next_id
+
+    def get(self, entity_id):
+        """Return the entity with this id, or None."""
+        return self._by_id.get(entity_id)
+
+    def lookup(self, item):
+        """Return (kind, entity) for an entity or one of its parts, or (None, None)."""
+        entity = self._owner_of.get(item, item)
+        kind = self._kind_of.get(entity)
+        if kind is None:
+            return None, None
+        return kind, entity
+
+    def remove(self, item):
+        """
+        Remove an entity (or the entity that `item` is a part of).
+        Returns its (kind, entity), or (None, None) if it was not registered.
+        """
+        kind, entity = self.lookup(item)
+        if kind is None:
+            return None, None
+        del self._kind_of[entity]
+        del self._by_id[entity.entity_id]
+        del self.collections[kind]._items[entity]
+        for part in self._parts.pop(entity, ()):
+            del self._owner_of[part]
+        return kind, entity
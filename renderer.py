@@ -0,0 +1,56 @@
+import pygame
+
+# Fall back to a full flip once the dirty area covers this fraction of the screen.
+DEFAULT_MAX_DIRTY_FRACTION = 0.5
+
+
+class Renderer:
+    """
+    Presents finished frames to the display.
+
+    By default every frame is pushed with pygame.display.flip(). In dirty
+    rectangle mode only the areas that changed are pushed with
+    pygame.display.update(rects): the rects added during this frame plus the
+    ones from the previous frame (where moving things used to be). A full
+    flip is still done after invalidate() and whenever the dirty area gets
+    too large for partial updates to pay off.
+    """
+
+    def __init__(self, screen, dirty_rects=False, max_dirty_fraction=DEFAULT_MAX_DIRTY_FRACTION):
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.max_dirty_fraction = max_dirty_fraction
+        self._rects = []
+        self._previous_rects = []
+        self._full_update = True
+
+    def add(self, rect):
+        """Mark an area that was drawn this frame."""
+        if self.dirty_rects and rect is not None:
+            self._rects.append(pygame.Rect(rect))
+
+    def add_all(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def invalidate(self):
+        """Force the next present() to push the whole screen."""
+        self._full_update = True
+
+    def present(self):
+        """Push the frame to the display and start tracking the next one."""
+        if not self.dirty_rects:
+            pygame.display.flip()
+            return
+        screen_rect = self.screen.get_rect()
+        rects = [r.clip(screen_rect) for r in self._rects + self._previous_rects]
+        rects = [r for r in rects if r.width > 0 and r.height > 0]
+        dirty_area = sum(r.width * r.height for r in rects)
+        max_area = screen_rect.width * screen_rect.height * self.max_dirty_fraction
+        if self._full_update or dirty_area > max_area:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        self._previous_rects = self._rects
+        self._rects = []
+        self._full_update = False
@@ -0,0 +1,197 @@
+"""
+Input recording and deterministic replay.
+
+A session file stores the RNG seed, the world size, the simulation rate
+and, for every simulation step, the input the game logic consumed: the events, the pressed keys, the mouse
+position and the pygame tick count. Replaying feeds exactly that input back
+into a fresh level, so the simulation runs the same way again.
+
+Usage (headless, no frame cap):
+    python replay.py session.rec
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+import pygame
+from benchmark import percentile
+from inventory import InventoryPanel
+from level import Level
+from player import Player
+from simulation import handle_event, init_headless, step
+from timestep import REFERENCE_RATE, sim_clock
+
+SESSION_VERSION = 1
+
+# Event attributes that the game logic reads, per event type.
+EVENT_FIELDS = {
+    pygame.KEYDOWN: ("key", "mod", "scancode", "unicode"),
+    pygame.KEYUP: ("key", "mod", "scancode"),
+    pygame.MOUSEBUTTONDOWN: ("pos", "button"),
+    pygame.MOUSEBUTTONUP: ("pos", "button"),
+    pygame.MOUSEMOTION: ("pos", "rel", "buttons"),
+    pygame.MOUSEWHEEL: ("x", "y", "flipped"),
+}
+
+
+def encode_event(event):
+    """Return a compact [type, {attr: value}] list, or None for events the game ignores."""
+    fields = EVENT_FIELDS.get(event.type)
+    if fields is None:
+        return None
+    attrs = {}
+    for name in fields:
+        value = getattr(event, name, None)
+        if value is not None:
+            attrs[name] = list(value) if isinstance(value, tuple) else value
+    return [event.type, attrs]
+
+
+def decode_event(data):
+    event_type, attrs = data
+    attrs = {name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+
+def encode_keys(keys):
+    """Return the indices of the pressed scancodes."""
+    # pygame-ce's ScancodeWrapper refuses plain iteration; it is still a tuple underneath.
+    return [i for i, down in enumerate(tuple.__iter__(keys)) if down]
+
+
+def decode_keys(pressed, size=512):
+    """Rebuild a key state that can be indexed with pygame.K_* like pygame.key.get_pressed()."""
+    pressed = set(pressed)
+    return pygame.key.ScancodeWrapper(i in pressed for i in range(size))
+
+
+class InputFrame:
+    """The input consumed by one frame of game logic."""
+
+    __slots__ = ("events", "keys", "mouse_pos", "ticks")
+
+    def __init__(self, events, keys, mouse_pos, ticks):
+        self.events = events
+        self.keys = keys
+        self.mouse_pos = mouse_pos
+        self.ticks = ticks
+
+
+class Session:
+    """A recorded session: seed, world size, simulation rate and the encoded frames."""
+
+    def __init__(self, seed, world_size, frames=None, sim_rate=REFERENCE_RATE):
+        self.seed = seed
+        self.world_size = tuple(world_size)
+        self.frames = frames if frames is not None else []
+        self.sim_rate = sim_rate
+
+    def __len__(self):
+        return len(self.frames)
+
+    def save(self, path):
+        header = {"version": SESSION_VERSION, "seed": self.seed, "world_size": list(self.world_size),
+                  "sim_rate": self.sim_rate, "frames": len(self.frames)}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for frame in self.frames:
+                f.write(json.dumps(frame, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != SESSION_VERSION:
+                raise ValueError(f"{path}: unsupported session version {header.get('version')}")
+            frames = [json.loads(line) for line in f if line.strip()]
+        return cls(header["seed"], header["world_size"], frames, header.get("sim_rate", REFERENCE_RATE))
+
+    def input_frames(self):
+        """Yield the decoded InputFrame of every recorded frame."""
+        key_cache = {}
+        for ticks, mouse_x, mouse_y, pressed, events in self.frames:
+            # Key states repeat for long stretches, so decode each distinct one once.
+            pressed_key = tuple(pressed)
+            keys = key_cache.get(pressed_key)
+            if keys is None:
+                keys = key_cache[pressed_key] = decode_keys(pressed)
+            yield InputFrame([decode_event(e) for e in events], keys, (mouse_x, mouse_y), ticks)
+
+
+class Recorder:
+    """
+    Records the input of each simulation step into a Session.
+
+    Create it before the level so that seed_rng() can seed the `random`
+    module (which also seeds the level's confetti), then call record() once
+    per simulation step with the input passed to the game logic.
+    """
+
+    def __init__(self, world_size, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.session = Session(seed, world_size, sim_rate=sim_clock.rate)
+
+    def seed_rng(self):
+        random.seed(self.session.seed)
+
+    def record(self, events, keys, mouse_pos, ticks):
+        encoded = [e for e in (encode_event(event) for event in events) if e is not None]
+        self.session.frames.append([ticks, mouse_pos[0], mouse_pos[1], encode_keys(keys), encoded])
+
+    def save(self, path):
+        self.session.save(path)
+
+
+class ReplaySimulation:
+    """A fresh level, player and inventory that replay a session step by step."""
+
+    def __init__(self, session):
+        self.session = session
+        # Steps only replay exactly at the rate they were recorded at.
+        sim_clock.set_rate(session.sim_rate)
+        random.seed(session.seed)
+        self.level = Level(world_size=session.world_size)
+        self.player = Player(x=100, y=300, width=40, height=40, world_size=session.world_size)
+        self.inventory = InventoryPanel(*session.world_size)
+
+    def step(self, frame, profiler=None):
+        """Run the game logic of one recorded frame; returns the trash collected."""
+        for event in frame.events:
+            handle_event(event, self.level, self.player, self.inventory, frame.mouse_pos)
+        self.inventory.update(frame.mouse_pos)
+        return step(self.level, self.player, frame.events, frame.keys, profiler, frame.mouse_pos, frame.ticks)
+
+    def run(self):
+        """Replay the whole session; returns the per-frame update times in milliseconds."""
+        times = []
+        for frame in self.session.input_frames():
+            start = time.perf_counter()
+            self.step(frame)
+            times.append((time.perf_counter() - start) * 1000)
+        return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless at full speed.")
+    parser.add_argument("session")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    session = Session.load(args.session)
+    sim = ReplaySimulation(session)
+    times = sorted(sim.run())
+    if not times:
+        print("empty session")
+        return
+    p95 = percentile(times, 95)
+    print(f"{len(times)} frames, total {sum(times):.1f} ms, mean {sum(times) / len(times):.3f} ms, "
+          f"p95 {p95:.3f} ms, max {times[-1]:.3f} ms")
+    print(f"player at {tuple(sim.player.rect.topleft)}, lives {sim.player.lives}, "
+          f"stars {sim.player.stars_collected}, trash {sim.player.trash_collected}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
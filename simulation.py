@@ -0,0 +1,103 @@
+import os
+import pygame
+from assets import assets
+from level import Level
+from player import Player
+
+DEFAULT_WORLD_SIZE = (1920, 1080)
+
+
+def handle_event(event, level, player, inventory, mouse_pos=None):
+    """
+    Apply one input event to the game: the inventory panel, its tools and
+    character control. Quitting, menus and debug keys are left to the caller.
+    """
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_i:
+        inventory.toggle(level.size[0])
+    inventory.handle_event(event, level, player, mouse_pos)
+
+    # Wenn auf den Spieler geklickt wird, alle gegnerischen Steuerungen zurücksetzen.
+    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        if player.rect.collidepoint(event.pos):
+            for enemy in level.enemies:
+                enemy.controlled = False
+
+
+def step(level, player, events=(), keys=None, profiler=None, mouse_pos=None, now=None):
+    """
+    Run one tick of game logic (no drawing).
+
+    `keys` is a key-state sequence like pygame.key.get_pressed(); when it is
+    None the real keyboard is read. Likewise `mouse_pos` and `now` (ms ticks)
+    default to the live mouse position and clock. If a FrameProfiler is
+    given, each stage is marked on it. Returns the number of trash items the
+    player collected this tick.
+    """
+    level.handle_mouse_events(events, keys, mouse_pos, now)
+    if profiler:
+        profiler.mark("mouse_events")
+
+    # If a monster is being controlled, move it; otherwise move the player.
+    controlled_enemy = None
+    for enemy in level.enemies:
+        if getattr(enemy, "controlled", False):
+            controlled_enemy = enemy
+            break
+
+    if controlled_enemy:
+        controlled_enemy.handle_input(keys)
+    else:
+        player.handle_input(keys)
+    if profiler:
+        profiler.mark("input")
+
+    elevator_movements = level.update(player)
+    trash_collected = level.collect_trash(player)
+    if profiler:
+        profiler.mark("level_update")
+    player.update(level.slides, level.trampolines, level, elevator_movements, keys)
+    if profiler:
+        profiler.mark("player_update")
+    return trash_collected
+
+
+def init_headless(load_textures=False):
+    """
+    Initialize pygame without a real window or audio device.
+
+    Uses the SDL dummy drivers (unless other drivers were requested through
+    the environment) and, by default, disables texture loading so entities
+    get blank surfaces of the right size.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    assets.set_textures_enabled(load_textures)
+
+
+class HeadlessSimulation:
+    """A level and a player that can be stepped without a display, e.g. for tests and benchmarks."""
+
+    def __init__(self, world_size=DEFAULT_WORLD_SIZE, level=None, player=None):
+        self.world_size = world_size
+        self.level = level if level is not None else Level(world_size=world_size)
+        self.player = player if player is not None else Player(x=100, y=300, width=40, height=40,
+                                                               world_size=world_size)
+        self.ticks = 0
+        # No keys pressed unless the caller passes its own key state.
+        self.no_keys = NoKeys()
+
+    def step(self, events=(), keys=None):
+        self.ticks += 1
+        return step(self.level, self.player, events, keys if keys is not None else self.no_keys)
+
+    def run(self, ticks, keys=None):
+        for _ in range(ticks):
+            self.step(keys=keys)
+
+
+class NoKeys:
+    """Key state with nothing pressed."""
+
+    def __getitem__(self, key):
+        return False
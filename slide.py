@@ -2,6 +2,7 @@ import pygame
 from dataclasses import dataclass
 from typing import Optional
 from draggable import Draggable
+from assets import assets
 
 @dataclass
 class SlidePhysics:
@@ -24,14 +25,12 @@ class SlidePlatform(Draggable):
         self._update_flip_icon_position()
 
     def _load_textures(self):
-        original = pygame.image.load("images/slide.png").convert_alpha()
         height = 120
         width = int(379 * (height / 349.0))
-        self.original_texture = pygame.transform.smoothscale(original, (width, height))
+        self.original_texture = assets.image("images/slide.png", (width, height))
         self.texture = self.original_texture  # Current texture
-        self.flipped_texture = pygame.transform.flip(self.texture, True, False)
-        self.rotate_icon = pygame.image.load("images/rotate.png").convert_alpha()
-        self.rotate_icon = pygame.transform.smoothscale(self.rotate_icon, (32, 32))
+        self.flipped_texture = assets.image("images/slide.png", (width, height), flip=True)
+        self.rotate_icon = assets.image("images/rotate.png", (32, 32))
 
     def _calculate_rect(self) -> pygame.Rect:
         mid_x = (self.start_x + self.end_x) // 2
@@ -46,12 +45,13 @@ class SlidePlatform(Draggable):
 
     def flip(self):
         self.is_flipped = not self.is_flipped
-        self.texture = pygame.transform.flip(self.texture, True, False)
+        self.texture = self.flipped_texture if self.is_flipped else self.original_texture
         self.start_x, self.end_x = self.end_x, self.start_x
         old_center = self.rect.center
         self.rect = self.texture.get_rect()
         self.rect.center = old_center
         self._update_flip_icon_position()
+        self.notify_changed()
 
     def contains_point(self, x: int, y: int, threshold: int = 30) -> bool:
         if not self.rect.collidepoint(x, y):
@@ -91,6 +91,7 @@ class SlidePlatform(Draggable):
         self.drag_offset_x = self.start_x - mouse_x
         self.drag_offset_y = self.start_y - mouse_y
         self.being_dragged = True
+        self.notify_changed()
 
     def update_drag(self, mouse_x, mouse_y):
         new_start_x = mouse_x + self.drag_offset_x
@@ -103,6 +104,7 @@ class SlidePlatform(Draggable):
         self.end_y += delta_y
         self.rect = self._calculate_rect()
         self._update_flip_icon_position()
+        self.notify_changed()
 
     def handle_click(self, event):
         """
@@ -0,0 +1,79 @@
+import os
+import pygame
+
+SOUNDS_DIR = "sounds"
+
+# Named voice sets for the playable characters. Each maps a role to the
+# name of a sound in the bank (the WAV file name without extension).
+VOICE_SETS = {
+    "big": {
+        "ouch": "big_player_ouch",
+        "boing": "big_player_boing",
+        "portal": "big_player_portal",
+        "shoot": "gun",
+    },
+    "small": {
+        "ouch": "small_player_ouch",
+        "boing": "small_player_boing",
+        "portal": "small_player_portal",
+        "shoot": "small_player_shoot",
+    },
+    "boy": {
+        "ouch": "boy_player_ouch",
+        "boing": "boy_player_boing",
+        "portal": "boy_player_portal",
+        "shoot": "gun",
+    },
+}
+
+
+class SilentSound:
+    """Stand-in used when the mixer is not available (e.g. headless simulation)."""
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+
+class SoundBank:
+    """
+    Decodes every WAV file in the sounds directory once.
+
+    pygame.mixer.Sound converts the samples to the mixer's format when it is
+    created, so all conversion happens on the first load and playing or
+    switching sounds afterwards never touches the disk. If the mixer is not
+    initialized, every sound is a SilentSound instead.
+    """
+
+    def __init__(self, directory=SOUNDS_DIR):
+        self.directory = directory
+        self.sounds = None
+
+    def load(self):
+        """Decode all WAV files in the directory (only done once)."""
+        if self.sounds is not None:
+            return
+        self.sounds = {}
+        mixer_ready = pygame.mixer.get_init() is not None
+        for filename in sorted(os.listdir(self.directory)):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() == ".wav":
+                if mixer_ready:
+                    self.sounds[name] = pygame.mixer.Sound(os.path.join(self.directory, filename))
+                else:
+                    self.sounds[name] = SilentSound()
+
+    def get(self, name):
+        """Return the decoded sound with the given name."""
+        self.load()
+        return self.sounds[name]
+
+    def voice(self, voice_set):
+        """Return a dict mapping each role of the named voice set to its sound."""
+        return {role: self.get(name) for role, name in VOICE_SETS[voice_set].items()}
+
+
+# Shared instance used by the player and the game loop.
+sound_bank = SoundBank()
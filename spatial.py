@@ -0,0 +1,145 @@
+import pygame
+
+DEFAULT_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """
+    Uniform grid index that maps items to the cells their rects overlap.
+
+    Queries return every item stored in the cells a rect covers (a
+    broadphase: callers still do the exact collision test), in the order the
+    items were first inserted so that collision resolution stays the same as
+    iterating over the original lists.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._item_cells = {}
+        self._order = {}
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._item_cells)
+
+    def __contains__(self, item):
+        return item in self._item_cells
+
+    def _cell_range(self, rect):
+        """Return the (left, top, right, bottom) cell coordinates `rect` covers, all inclusive."""
+        size = self.cell_size
+        left = rect.left // size
+        top = rect.top // size
+        right = max(rect.left, rect.right - 1) // size
+        bottom = max(rect.top, rect.bottom - 1) // size
+        return left, top, right, bottom
+
+    def _add_to_cells(self, item, cell_range):
+        cells = self._cells
+        left, top, right, bottom = cell_range
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[cx, cy] = {item}
+                else:
+                    bucket.add(item)
+
+    def _remove_from_cells(self, item, cell_range):
+        cells = self._cells
+        left, top, right, bottom = cell_range
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells[cx, cy]
+                bucket.discard(item)
+                if not bucket:
+                    del cells[cx, cy]
+
+    def insert(self, item, rect):
+        """Add `item` covering `rect` (updates it if it is already indexed)."""
+        self.insert_many(((item, rect),))
+
+    def insert_many(self, pairs):
+        """Add many (item, rect) pairs at once (same result as inserting them in order)."""
+        cells = self._cells
+        item_cells = self._item_cells
+        order = self._order
+        size = self.cell_size
+        next_order = self._next_order
+        for item, rect in pairs:
+            if item in item_cells:
+                self.update(item, rect)
+                continue
+            order[item] = next_order
+            next_order += 1
+            # Same as _cell_range() and _add_to_cells(), inlined for big batches.
+            x, y, width, height = rect
+            left = x // size
+            top = y // size
+            right = (x + width - 1) // size if width > 0 else left
+            bottom = (y + height - 1) // size if height > 0 else top
+            item_cells[item] = (left, top, right, bottom)
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[cx, cy] = {item}
+                    else:
+                        bucket.add(item)
+        self._next_order = next_order
+
+    def remove(self, item):
+        covered = self._item_cells.pop(item, None)
+        if covered is None:
+            return
+        del self._order[item]
+        self._remove_from_cells(item, covered)
+
+    def update(self, item, rect):
+        """Move `item` to the cells covered by `rect`."""
+        old = self._item_cells.get(item)
+        if old is None:
+            self.insert(item, rect)
+            return
+        new = self._cell_range(rect)
+        if new == old:
+            return
+        self._remove_from_cells(item, old)
+        self._add_to_cells(item, new)
+        self._item_cells[item] = new
+
+    def items(self):
+        """Return every indexed item, in insertion order."""
+        return sorted(self._item_cells, key=self._order.__getitem__)
+
+    def query(self, rect):
+        """Return the items in all cells covered by `rect`, in insertion order."""
+        rect = pygame.Rect(rect)
+        size = self.cell_size
+        left = rect.left // size
+        top = rect.top // size
+        right = max(rect.left, rect.right - 1) // size
+        bottom = max(rect.top, rect.bottom - 1) // size
+        found = set()
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=self._order.__getitem__)
+
+    def query_point(self, x, y):
+        """Return the items in the cell containing the point (x, y), in insertion order."""
+        bucket = self._cells.get((int(x) // self.cell_size, int(y) // self.cell_size))
+        if not bucket:
+            return []
+        return sorted(bucket, key=self._order.__getitem__)
+
+    def clear(self):
+        self._cells.clear()
+        self._item_cells.clear()
+        self._order.clear()
@@ -1,11 +1,10 @@
-import pygame
 from draggable import Draggable
+from assets import assets
 
 class Star(Draggable):
     def __init__(self, x, y):
         Draggable.__init__(self)
-        self.image = pygame.image.load("images/star.png").convert_alpha()
-        self.image = pygame.transform.smoothscale(self.image, (40, 40))
+        self.image = assets.image("images/star.png", (40, 40))
         self.rect = self.image.get_rect(center=(x, y))
         self.collected = False
 
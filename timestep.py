@@ -0,0 +1,107 @@
+# Speeds, gravity and frame timers in the game are tuned per tick at this rate.
+REFERENCE_RATE = 60
+# Never run more than this many simulation steps for one rendered frame;
+# after a long stall the game slows down instead of freezing to catch up.
+MAX_STEPS_PER_FRAME = 5
+# Things that moved further than this in one step (respawns, portals,
+# reused pool objects) are drawn at their new position, not interpolated.
+MAX_INTERPOLATION_DISTANCE = 200
+
+
+class SimClock:
+    """
+    The simulation rate shared by everything that moves.
+
+    Game constants are per tick at REFERENCE_RATE. When the simulation runs
+    at a different rate, each step covers `tick_scale` reference ticks, so
+    movement and timers are multiplied by it and the game plays at the same
+    speed (1.0 at the default rate).
+    """
+
+    def __init__(self, rate=REFERENCE_RATE):
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.step_seconds = 1.0 / rate
+        self.tick_scale = REFERENCE_RATE / rate
+
+
+class FixedTimestep:
+    """
+    Accumulates real frame time and turns it into whole simulation steps.
+
+    advance(frame_seconds) returns how many steps to run this frame; `alpha`
+    is how far the leftover time is into the next step, used to draw moving
+    things between their last two simulated positions.
+    """
+
+    def __init__(self, clock, max_steps=MAX_STEPS_PER_FRAME):
+        self.clock = clock
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, frame_seconds):
+        step = self.clock.step_seconds
+        self.accumulator += frame_seconds
+        steps = int(self.accumulator / step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * step
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.clock.step_seconds, 1.0)
+
+
+class Interpolator:
+    """
+    Draws moving rects between their previous and current simulated positions.
+
+    capture() remembers where the rects are before the last simulation step
+    of a frame; inside apply(alpha) each rect is temporarily moved to the
+    blended position, and put back afterwards.
+    """
+
+    def __init__(self):
+        self._previous = []
+
+    def capture(self, rects):
+        self._previous = [(rect, rect.x, rect.y) for rect in rects]
+
+    def clear(self):
+        self._previous = []
+
+    def apply(self, alpha):
+        return _Interpolated(self._previous, alpha)
+
+
+class _Interpolated:
+    def __init__(self, previous, alpha):
+        self.previous = previous
+        self.alpha = alpha
+        self.restore = []
+
+    def __enter__(self):
+        alpha = self.alpha
+        for rect, prev_x, prev_y in self.previous:
+            x, y = rect.x, rect.y
+            if abs(x - prev_x) > MAX_INTERPOLATION_DISTANCE or abs(y - prev_y) > MAX_INTERPOLATION_DISTANCE:
+                continue
+            self.restore.append((rect, x, y))
+            rect.x = round(prev_x + (x - prev_x) * alpha)
+            rect.y = round(prev_y + (y - prev_y) * alpha)
+        return self
+
+    def __exit__(self, *exc):
+        for rect, x, y in self.restore:
+            rect.x = x
+            rect.y = y
+        return False
+
+
+# Shared instance; set_rate() is called once at startup (or by replays).
+sim_clock = SimClock()
@@ -1,5 +1,6 @@
 import pygame
 from draggable import Draggable
+from assets import assets
 
 class Trampoline(Draggable):
     DEFAULT_IMAGE_PATH = "images/trampoline.png"
@@ -10,8 +11,7 @@ class Trampoline(Draggable):
         if height is None:
             height = Trampoline.DEFAULT_HEIGHT
         self.rect = pygame.Rect(x, y, width, height)
-        original = pygame.image.load(Trampoline.DEFAULT_IMAGE_PATH).convert_alpha()
-        self.texture = pygame.transform.smoothscale(original, (width, height))
+        self.texture = assets.image(Trampoline.DEFAULT_IMAGE_PATH, (width, height))
 
     def draw(self, surface):
         if self.being_dragged:
@@ -1,12 +1,11 @@
-import pygame
 from draggable import Draggable
+from assets import assets
 
 class Trash(Draggable):
     def __init__(self, x, y):
         super().__init__()
         # Load the trash image and scale it to 40x40 (you can adjust as needed)
-        self.image = pygame.image.load("images/trash.png").convert_alpha()
-        self.image = pygame.transform.smoothscale(self.image, (40, 40))
+        self.image = assets.image("images/trash.png", (40, 40))
         self.rect = self.image.get_rect(center=(x, y))
 
     def draw(self, surface):